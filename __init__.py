@@ -9,10 +9,12 @@ bl_info = {
 }
 
 import bpy
+from . import diagnostics
 from . import main
 from . import model
 
 def delayed_register():
+    diagnostics.register()
     main.register()
     model.register()
 
@@ -22,6 +24,7 @@ def register():
 def unregister():
     model.unregister()
     main.unregister()
+    diagnostics.unregister()
 
 if __name__ == "__main__":
     register()
@@ -0,0 +1,105 @@
+import bpy
+import numpy as np
+from contextlib import contextmanager
+from . import figure_registry
+
+# Height changes from the 身長 slider. Drag ticks only record the target;
+# the scale is written once the value has settled, straight into
+# delta_scale of every selected armature, followed by a single undo push.
+#
+# Heights are measured on the rest pose: bone heads and tails are read in
+# bulk once per armature datablock and cached until the depsgraph reports
+# that armature as updated, so a crouching pose does not change the value
+# and no evaluation is forced.
+
+HEIGHT_APPLY_DELAY = 0.15
+
+_pending = {}
+_state = {"depth": 0}
+_rest_points = {}   # armature name_full -> (2 * bones, 3) head/tail array
+
+def is_syncing():
+    return _state["depth"] > 0
+
+@contextmanager
+def syncing():
+    # For writes to armature_height_cm that only display a measured value.
+    _state["depth"] += 1
+    try:
+        yield
+    finally:
+        _state["depth"] -= 1
+
+def invalidate(names=None):
+    if names is None:
+        _rest_points.clear()
+    else:
+        for name in names:
+            _rest_points.pop(name, None)
+
+def rest_points(arm):
+    points = _rest_points.get(arm.name_full)
+    if points is None:
+        n = len(arm.bones)
+        points = np.empty(n * 6, dtype=np.float32)
+        arm.bones.foreach_get("head_local", points[:n * 3])
+        arm.bones.foreach_get("tail_local", points[n * 3:])
+        points = _rest_points[arm.name_full] = points.reshape(-1, 3)
+    return points
+
+def measure(obj):
+    # World-space height of the rest pose; falls back to the bounds for
+    # armatures without bones.
+    points = rest_points(obj.data)
+    if not len(points):
+        return obj.dimensions.z
+    m = np.array(obj.matrix_world, dtype=np.float32)
+    z = points @ m[2, :3] + m[2, 3]
+    return float(z.max() - z.min())
+
+def set_height(objs, height):
+    changed = 0
+    for obj in objs:
+        current = measure(obj)
+        if current <= 0:
+            continue
+        factor = height / current
+        if abs(factor - 1.0) < 1e-6:
+            continue
+        obj.delta_scale = [v * factor for v in obj.delta_scale]
+        changed += 1
+    return changed
+
+def _apply_pending():
+    height = _pending.pop("height", None)
+    names = _pending.pop("objects", ())
+    if height is None:
+        return None
+    objs = [o for o in map(bpy.data.objects.get, names) if o and o.type == 'ARMATURE']
+    if set_height(objs, height) and not bpy.app.background:
+        try:
+            bpy.ops.ed.undo_push(message="身長変更")
+        except RuntimeError:
+            pass
+    return None
+
+def schedule(context, height_cm):
+    if height_cm <= 0:
+        return
+    objs = figure_registry.selected_armatures(context)
+    if not objs:
+        return
+    _pending["height"] = height_cm / 100.0
+    _pending["objects"] = [o.name for o in objs]
+    if bpy.app.background:
+        _apply_pending()
+        return
+    if bpy.app.timers.is_registered(_apply_pending):
+        bpy.app.timers.unregister(_apply_pending)
+    bpy.app.timers.register(_apply_pending, first_interval=HEIGHT_APPLY_DELAY)
+
+def unregister():
+    if bpy.app.timers.is_registered(_apply_pending):
+        bpy.app.timers.unregister(_apply_pending)
+    _pending.clear()
+    _rest_points.clear()
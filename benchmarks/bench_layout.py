@@ -0,0 +1,254 @@
+# Scalability benchmark for the 3dlayout addon.
+#
+#   blender -b --factory-startup --python benchmarks/bench_layout.py -- \
+#       --cuts 300 --objects 20 --books 50 --figures 5 --output bench.json
+#
+# or, with the bpy wheel installed:
+#
+#   python benchmarks/bench_layout.py --cuts 300 --objects 20
+#
+# A synthetic shot file is generated (N cuts with M objects each, a shared
+# set, K Books and linked figures from model/Default_Figure.blend) and the
+# addon's hot paths are timed. Results are written as JSON so runs from
+# different versions can be diffed.
+
+import argparse
+import importlib.util
+import json
+import os
+import statistics
+import sys
+import time
+
+import bpy
+
+ADDON_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ADDON_NAME = "layout_addon"
+
+CUBE_VERTS = [
+    (-0.5, -0.5, 0.0), (0.5, -0.5, 0.0), (0.5, 0.5, 0.0), (-0.5, 0.5, 0.0),
+    (-0.5, -0.5, 1.0), (0.5, -0.5, 1.0), (0.5, 0.5, 1.0), (-0.5, 0.5, 1.0),
+]
+CUBE_FACES = [
+    (0, 1, 2, 3), (4, 5, 6, 7), (0, 1, 5, 4),
+    (1, 2, 6, 5), (2, 3, 7, 6), (3, 0, 4, 7),
+]
+
+def parse_args():
+    argv = sys.argv[sys.argv.index("--") + 1:] if "--" in sys.argv else sys.argv[1:]
+    parser = argparse.ArgumentParser(description="3dlayout scalability benchmark")
+    parser.add_argument("--cuts", type=int, default=50, help="cameras / cuts")
+    parser.add_argument("--objects", type=int, default=20, help="objects per cut")
+    parser.add_argument("--set-objects", type=int, default=50, help="objects in the shared set")
+    parser.add_argument("--books", type=int, default=10, help="Books to create")
+    parser.add_argument("--figures", type=int, default=3, help="default figures to link")
+    parser.add_argument("--batch", type=int, default=50, help="figures per batched figure.add")
+    parser.add_argument("--repeat", type=int, default=10, help="samples per measurement")
+    parser.add_argument("--output", default="", help="write JSON results to this path")
+    parser.add_argument("--save", default="", help="save the generated .blend here")
+    return parser.parse_args(argv)
+
+def load_addon():
+    spec = importlib.util.spec_from_file_location(
+        ADDON_NAME,
+        os.path.join(ADDON_DIR, "__init__.py"),
+        submodule_search_locations=[ADDON_DIR]
+    )
+    addon = importlib.util.module_from_spec(spec)
+    sys.modules[ADDON_NAME] = addon
+    spec.loader.exec_module(addon)
+    # __init__.register defers through a timer, which never fires in -b.
+    addon.main.register()
+    addon.model.register()
+    return addon
+
+def summarize(samples):
+    ordered = sorted(samples)
+    return {
+        "runs": len(samples),
+        "min": ordered[0],
+        "median": statistics.median(ordered),
+        "mean": statistics.fmean(ordered),
+        "p95": ordered[min(len(ordered) - 1, int(round(0.95 * (len(ordered) - 1))))],
+        "max": ordered[-1],
+        "total": sum(ordered),
+    }
+
+def measure(results, name, fn, repeat, setup=None, teardown=None):
+    samples = []
+    for i in range(repeat):
+        state = setup(i) if setup else None
+        t0 = time.perf_counter()
+        fn(i, state)
+        samples.append(time.perf_counter() - t0)
+        if teardown:
+            teardown(i, state)
+    results[name] = summarize(samples)
+    print(f"{name:<28} median {results[name]['median'] * 1000:9.2f} ms")
+
+def select_only(objs):
+    for o in bpy.context.view_layer.objects:
+        o.select_set(False)
+    for o in objs:
+        o.select_set(True)
+    if objs:
+        bpy.context.view_layer.objects.active = objs[0]
+
+def add_cut(scene, index, mesh, objects):
+    name = f"C{index:03d}_Camera"
+    cam_data = bpy.data.cameras.new(name)
+    cam = bpy.data.objects.new(name, cam_data)
+    coll = bpy.data.collections.new(name)
+    scene.collection.children.link(coll)
+    coll.objects.link(cam)
+    cam.location = (index * 3.0, -10.0, 1.6)
+    cam.resolution_xy = (1920, 1080)
+    for j in range(objects):
+        o = bpy.data.objects.new(f"{name}_Prop{j:03d}", mesh)
+        o.location = (index * 3.0 + (j % 5), j // 5, 0.0)
+        coll.objects.link(o)
+    return cam
+
+def generate_scene(main, args):
+    scene = bpy.context.scene
+    mesh = bpy.data.meshes.new("BenchCube")
+    mesh.from_pydata(CUBE_VERTS, [], CUBE_FACES)
+
+    set_coll = bpy.data.collections.new("Set")
+    scene.collection.children.link(set_coll)
+    set_objs = []
+    for j in range(args.set_objects):
+        o = bpy.data.objects.new(f"Set_Prop{j:03d}", mesh.copy())
+        o.location = (j % 10, j // 10, 0.0)
+        set_coll.objects.link(o)
+        set_objs.append(o)
+
+    cams = [add_cut(scene, i, mesh, args.objects) for i in range(args.cuts)]
+    main.update_camera_list(scene)
+
+    for k in range(args.books):
+        scene.camera = cams[k % len(cams)]
+        picks = [set_objs[(k + n) % len(set_objs)] for n in range(3)] if set_objs else []
+        select_only(picks)
+        bpy.ops.object.separate_objects(book_n=k + 1)
+
+    scene.camera = cams[0]
+    for _ in range(args.figures):
+        bpy.ops.figure.add()
+
+    main.update_camera_list(scene)
+    return cams, set_objs
+
+def run(args):
+    bpy.ops.wm.read_factory_settings(use_empty=True)
+    addon = load_addon()
+    main = addon.main
+
+    t0 = time.perf_counter()
+    cams, set_objs = generate_scene(main, args)
+    generate_time = time.perf_counter() - t0
+
+    scene = bpy.context.scene
+    results = {}
+    repeat = max(1, args.repeat)
+
+    def switch(i, state):
+        scene.camera_index = (scene.camera_index + 1 + i * 7) % len(scene.camera_list)
+
+    measure(results, "update_camera", switch, repeat)
+
+    def handler(i, state):
+        main._depsgraph_handler(scene, bpy.context.evaluated_depsgraph_get())
+
+    measure(results, "_depsgraph_handler", handler, repeat)
+
+    def dup_setup(i):
+        src = bpy.data.collections.get(cams[i % len(cams)].name)
+        dest = bpy.data.collections.new(f"Bench Copy {i}")
+        scene.collection.children.link(dest)
+        return src, dest
+
+    def dup_run(i, state):
+        src, dest = state
+        main.duplicate_collection(src, dest)
+
+    def dup_teardown(i, state):
+        src, dest = state
+        for o in list(dest.all_objects):
+            bpy.data.objects.remove(o, do_unlink=True)
+        for c in list(dest.children_recursive):
+            bpy.data.collections.remove(c)
+        bpy.data.collections.remove(dest)
+
+    measure(results, "duplicate_collection", dup_run, repeat, dup_setup, dup_teardown)
+
+    def separate_setup(i):
+        scene.camera = cams[i % len(cams)]
+        select_only([set_objs[i % len(set_objs)]] if set_objs else [])
+
+    def separate_run(i, state):
+        bpy.ops.object.separate_objects(book_n=1000 + i)
+
+    measure(results, "OBJECT_separate_objects", separate_run, repeat, separate_setup)
+
+    def figure_setup(i):
+        scene.camera = cams[i % len(cams)]
+        bpy.context.window_manager.figure_mode = 'DEFAULT'
+
+    def figure_run(i, state):
+        bpy.ops.figure.add()
+
+    measure(results, "Figure_OT_add", figure_run, repeat, figure_setup)
+
+    def figure_batch_run(i, state):
+        bpy.ops.figure.add(count=args.batch, use_grid=True, columns=10, spacing=1.0)
+
+    measure(results, f"Figure_OT_add x{args.batch}", figure_batch_run, max(1, repeat // 5), figure_setup)
+
+    def compositor_build_setup(i):
+        scene.camera = cams[i % len(cams)]
+        scene.use_nodes = True
+        scene.node_tree["composite_setup_done"] = False
+
+    def compositor_run(i, state):
+        main.setup_frame_compositor(scene)
+
+    measure(results, "compositor_build", compositor_run, repeat, compositor_build_setup)
+    measure(results, "compositor_update", compositor_run, repeat)
+
+    report = {
+        "addon_version": list(addon.bl_info["version"]),
+        "blender_version": bpy.app.version_string,
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "params": {
+            "cuts": args.cuts,
+            "objects_per_cut": args.objects,
+            "set_objects": args.set_objects,
+            "books": args.books,
+            "figures": args.figures,
+            "batch": args.batch,
+            "repeat": repeat,
+        },
+        "scene": {
+            "objects": len(bpy.data.objects),
+            "collections": len(bpy.data.collections),
+            "generate_seconds": generate_time,
+        },
+        "timings": results,
+        "handlers": addon.diagnostics.snapshot(),
+    }
+    if args.save:
+        bpy.ops.wm.save_as_mainfile(filepath=os.path.abspath(args.save))
+    return report
+
+def main():
+    args = parse_args()
+    report = run(args)
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text)
+    print(text)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,301 @@
+import gzip
+import mmap
+import os
+import re
+import struct
+import zlib
+
+# Read-only .blend reader that does not need bpy. It walks the block header
+# (BHead) chain, keeps the ID names of the types listed in ID_CODES and the
+# file thumbnail, and skips every other block, so a whole library tree can
+# be indexed from a plain Python process:
+#
+#   python blend_reader.py /path/to/library -o index.json
+#
+# Uncompressed files are mapped; gzip and zstd files are decompressed as a
+# stream. Name offsets come from the file's own SDNA, which is written at
+# the end of the file, so ID blocks are held as short prefixes until then.
+
+ID_CODES = {
+    b"GR\0\0": "collections",
+    b"OB\0\0": "objects",
+    b"AR\0\0": "armatures",
+}
+
+ID_PREFIX_BYTES = 512
+
+class BlendFileError(Exception):
+    pass
+
+def _zstd_reader(f):
+    try:
+        import zstandard
+        return zstandard.ZstdDecompressor().stream_reader(f)
+    except ImportError:
+        pass
+    try:
+        from compression import zstd
+        return zstd.ZstdFile(f)
+    except ImportError:
+        raise BlendFileError("zstd compressed .blend needs the zstandard module")
+
+class _Mapped:
+    def __init__(self, buf):
+        self.buf = buf
+        self.pos = 0
+
+    def read(self, n):
+        data = self.buf[self.pos:self.pos + n]
+        self.pos += len(data)
+        return data
+
+    def skip(self, n):
+        self.pos += n
+
+class _Stream:
+    def __init__(self, f):
+        self.f = f
+
+    def read(self, n):
+        chunks = []
+        while n > 0:
+            chunk = self.f.read(n)
+            if not chunk:
+                break
+            chunks.append(chunk)
+            n -= len(chunk)
+        return b"".join(chunks)
+
+    def skip(self, n):
+        while n > 0:
+            chunk = self.f.read(min(n, 1 << 20))
+            if not chunk:
+                break
+            n -= len(chunk)
+
+def _parse_header(src):
+    head = bytes(src.read(12))
+    if head[:7] != b"BLENDER":
+        raise BlendFileError("not a .blend file")
+    if head[7:9].isdigit():
+        # "BLENDER17-01v0500": header size, pointer size, format version,
+        # endianness and Blender version.
+        size = int(head[7:9])
+        rest = head[9:] + bytes(src.read(size - 12))
+        if rest[:1] != b"-" or rest[3:4] not in (b"v", b"V"):
+            raise BlendFileError("unknown .blend header")
+        fmt = int(rest[1:3])
+        if fmt != 1:
+            raise BlendFileError(f"unsupported .blend format {fmt}")
+        endian = "<" if rest[3:4] == b"v" else ">"
+        return {
+            "pointer_size": 8,
+            "endian": endian,
+            "version": int(rest[4:]),
+            "bhead": struct.Struct(endian + "4siQqq"),
+            "large": True,
+        }
+    if head[7:8] not in (b"_", b"-") or head[8:9] not in (b"v", b"V"):
+        raise BlendFileError("unknown .blend header")
+    pointer_size = 4 if head[7:8] == b"_" else 8
+    endian = "<" if head[8:9] == b"v" else ">"
+    ptr = "I" if pointer_size == 4 else "Q"
+    return {
+        "pointer_size": pointer_size,
+        "endian": endian,
+        "version": int(head[9:12]),
+        "bhead": struct.Struct(endian + "4si" + ptr + "ii"),
+        "large": False,
+    }
+
+def _bheads(src, header):
+    bhead = header["bhead"]
+    large = header["large"]
+    while True:
+        raw = src.read(bhead.size)
+        if len(raw) < bhead.size:
+            return
+        if large:
+            code, _sdna, _old, length, _nr = bhead.unpack(raw)
+        else:
+            code, length, _old, _sdna, _nr = bhead.unpack(raw)
+        if code == b"ENDB":
+            return
+        yield code, length
+
+def _align4(offset):
+    return (offset + 3) & ~3
+
+def _parse_sdna(data, endian, pointer_size):
+    data = bytes(data)
+    if data[:4] != b"SDNA":
+        raise BlendFileError("bad SDNA block")
+    i32 = struct.Struct(endian + "i")
+    i16 = struct.Struct(endian + "h")
+    pos = 4
+
+    def strings(tag, pos):
+        if data[pos:pos + 4] != tag:
+            raise BlendFileError(f"bad SDNA {tag!r} section")
+        count = i32.unpack_from(data, pos + 4)[0]
+        pos += 8
+        out = []
+        for _ in range(count):
+            end = data.index(b"\0", pos)
+            out.append(data[pos:end].decode("latin-1"))
+            pos = end + 1
+        return out, _align4(pos)
+
+    names, pos = strings(b"NAME", pos)
+    types, pos = strings(b"TYPE", pos)
+    if data[pos:pos + 4] != b"TLEN":
+        raise BlendFileError("bad SDNA TLEN section")
+    pos += 4
+    lengths = [i16.unpack_from(data, pos + 2 * n)[0] for n in range(len(types))]
+    pos = _align4(pos + 2 * len(types))
+    if data[pos:pos + 4] != b"STRC":
+        raise BlendFileError("bad SDNA STRC section")
+    count = i32.unpack_from(data, pos + 4)[0]
+    pos += 8
+    for _ in range(count):
+        type_idx, nr_fields = struct.unpack_from(endian + "hh", data, pos)
+        pos += 4
+        fields = [struct.unpack_from(endian + "hh", data, pos + 4 * n) for n in range(nr_fields)]
+        pos += 4 * nr_fields
+        if types[type_idx] != "ID":
+            continue
+        offset = 0
+        for f_type, f_name in fields:
+            name = names[f_name]
+            dims = 1
+            for d in re.findall(r"\[(\d+)\]", name):
+                dims *= int(d)
+            if name.startswith("*") or name.startswith("("):
+                size = pointer_size * dims
+            else:
+                size = lengths[f_type] * dims
+            if name.split("[", 1)[0] == "name":
+                return offset, size
+            offset += size
+        break
+    raise BlendFileError("ID.name not found in SDNA")
+
+def _id_name(prefix, offset, size):
+    raw = bytes(prefix[offset:offset + size])
+    raw = raw.split(b"\0", 1)[0]
+    return raw[2:].decode("utf-8", errors="replace")
+
+def _scan(src, want_thumbnail):
+    header = _parse_header(src)
+    endian = header["endian"]
+    pending = []
+    thumbnail = None
+    sdna = None
+    for code, length in _bheads(src, header):
+        field = ID_CODES.get(code)
+        if field is not None:
+            take = min(length, ID_PREFIX_BYTES)
+            pending.append((field, bytes(src.read(take))))
+            src.skip(length - take)
+        elif code == b"TEST" and want_thumbnail and length >= 8:
+            data = bytes(src.read(length))
+            w, h = struct.unpack_from(endian + "ii", data, 0)
+            if w > 0 and h > 0 and len(data) >= 8 + w * h * 4:
+                thumbnail = (w, h, data[8:8 + w * h * 4])
+        elif code == b"DNA1":
+            sdna = _parse_sdna(src.read(length), endian, header["pointer_size"])
+        else:
+            src.skip(length)
+
+    result = {field: [] for field in ID_CODES.values()}
+    if pending:
+        if sdna is None:
+            raise BlendFileError("no SDNA block")
+        offset, size = sdna
+        for field, prefix in pending:
+            result[field].append(_id_name(prefix, offset, size))
+    result["version"] = header["version"]
+    result["thumbnail"] = thumbnail
+    return result
+
+def read(path, want_thumbnail=True):
+    with open(path, "rb") as f:
+        magic = f.read(4)
+        f.seek(0)
+        if magic[:2] == b"\x1f\x8b":
+            with gzip.GzipFile(fileobj=f) as g:
+                return _scan(_Stream(g), want_thumbnail)
+        if magic == b"\x28\xb5\x2f\xfd":
+            return _scan(_Stream(_zstd_reader(f)), want_thumbnail)
+        if os.fstat(f.fileno()).st_size == 0:
+            raise BlendFileError("empty file")
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+            return _scan(_Mapped(buf), want_thumbnail)
+
+def thumbnail_png(thumbnail):
+    # The thumbnail is stored bottom row first.
+    w, h, rgba = thumbnail
+    stride = w * 4
+    raw = b"".join(
+        b"\0" + rgba[y * stride:(y + 1) * stride]
+        for y in range(h - 1, -1, -1)
+    )
+
+    def chunk(tag, data):
+        body = tag + data
+        return struct.pack(">I", len(data)) + body + struct.pack(">I", zlib.crc32(body) & 0xffffffff)
+
+    return b"".join((
+        b"\x89PNG\r\n\x1a\n",
+        chunk(b"IHDR", struct.pack(">IIBBBBB", w, h, 8, 6, 0, 0, 0)),
+        chunk(b"IDAT", zlib.compress(raw, 6)),
+        chunk(b"IEND", b""),
+    ))
+
+def index_tree(root, thumbnails_dir=None):
+    index = {}
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = sorted(d for d in dirnames if not d.startswith("."))
+        for name in sorted(filenames):
+            if not name.lower().endswith(".blend"):
+                continue
+            path = os.path.join(dirpath, name)
+            rel = os.path.relpath(path, root).replace(os.sep, "/")
+            st = os.stat(path)
+            entry = {"stamp": [st.st_mtime, st.st_size]}
+            try:
+                info = read(path, want_thumbnail=thumbnails_dir is not None)
+            except (OSError, BlendFileError, struct.error, ValueError) as e:
+                entry["error"] = str(e)
+                index[rel] = entry
+                continue
+            for field in ID_CODES.values():
+                entry[field] = info[field]
+            entry["version"] = info["version"]
+            if thumbnails_dir and info["thumbnail"]:
+                png = os.path.join(thumbnails_dir, rel[:-len(".blend")] + ".png")
+                os.makedirs(os.path.dirname(png), exist_ok=True)
+                with open(png, "wb") as f:
+                    f.write(thumbnail_png(info["thumbnail"]))
+                entry["thumbnail"] = os.path.relpath(png, thumbnails_dir).replace(os.sep, "/")
+            index[rel] = entry
+    return index
+
+def main(argv=None):
+    import argparse
+    import json
+    parser = argparse.ArgumentParser(description="Index .blend libraries without Blender")
+    parser.add_argument("root", help="folder to index")
+    parser.add_argument("-o", "--output", default="", help="write the index to this JSON file")
+    parser.add_argument("--thumbnails", default="", help="write PNG thumbnails under this folder")
+    args = parser.parse_args(argv)
+    index = index_tree(args.root, args.thumbnails or None)
+    text = json.dumps(index, indent=2, ensure_ascii=False)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text)
+    else:
+        print(text)
+
+if __name__ == "__main__":
+    main()
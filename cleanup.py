@@ -0,0 +1,171 @@
+import time
+import bpy
+from collections import deque
+from . import collection_graph
+from . import diagnostics
+from . import switch_registry
+from . import visibility
+
+# Datablocks created by the addon (Book / source collections, Book copies,
+# their data and materials) carry this marker, holding the name they were
+# created with. ID properties survive copy / Shift+D, so a marker only counts
+# while it still matches the datablock's name; an artist's duplicate (or a
+# renamed original) is never reclaimed.
+OWNED_KEY = "_3dlayout_owned"
+
+SLICE_BUDGET = 0.004
+SLICE_INTERVAL = 0.05
+START_DELAY = 0.5
+
+# Objects come before data and materials so those drop to zero users
+# within the same sweep.
+_ID_TYPES = (
+    ("collections", "Collection"),
+    ("objects", "Object"),
+    ("meshes", "Mesh"),
+    ("curves", "Curve"),
+    ("materials", "Material"),
+)
+
+_owned = {attr: set() for attr, _ in _ID_TYPES}
+_queue = deque()
+_state = {"built": False, "unpaired": None}
+
+def _data_attr(id_block):
+    for attr, type_name in _ID_TYPES:
+        if isinstance(id_block, getattr(bpy.types, type_name)):
+            return attr
+    return None
+
+def mark(id_block):
+    attr = _data_attr(id_block)
+    if attr is None:
+        return
+    id_block[OWNED_KEY] = id_block.name
+    _owned[attr].add(id_block.name)
+
+def rebuild():
+    for attr, _ in _ID_TYPES:
+        names = _owned[attr]
+        names.clear()
+        names.update(i.name for i in getattr(bpy.data, attr) if _marked(i))
+    # Book and source collections from files saved before the marker existed.
+    _owned["collections"].update(c.name for c in switch_registry.keyed_collections())
+    _queue.clear()
+    _state["built"] = True
+    _state["unpaired"] = None
+
+def clear():
+    for names in _owned.values():
+        names.clear()
+    _queue.clear()
+    _state["built"] = False
+    _state["unpaired"] = None
+
+def reclaim_orphan(data, name):
+    # Returns the existing datablock unless it is an orphan we own, in which
+    # case it is removed so the caller can create a fresh, linked one.
+    id_block = data.get(name)
+    if id_block is not None and id_block.users == 0 and _is_owned(id_block):
+        if isinstance(id_block, bpy.types.Collection):
+            switch_registry.discard_collection(id_block.name)
+        data.remove(id_block)
+        return None
+    return id_block
+
+def _dissolve(coll, scene):
+    target_parent = collection_graph.parent(coll, scene) or scene.collection
+
+    for child in list(coll.children):
+        collection_graph.link_child(target_parent, child)
+        collection_graph.unlink_child(coll, child)
+
+    for obj in list(coll.objects):
+        if obj.name not in target_parent.objects:
+            target_parent.objects.link(obj)
+        coll.objects.unlink(obj)
+
+    switch_registry.discard_collection(coll.name)
+    collection_graph.remove(coll)
+    visibility.invalidate(scene)
+
+def _marked(id_block):
+    return id_block.get(OWNED_KEY) == id_block.name
+
+def _is_owned(id_block):
+    if OWNED_KEY in id_block:
+        return _marked(id_block)
+    return isinstance(id_block, bpy.types.Collection) and switch_registry.has_keys(id_block)
+
+def _collect(attr, name, scene):
+    data = getattr(bpy.data, attr)
+    id_block = data.get(name)
+    if id_block is None or not _is_owned(id_block):
+        _owned[attr].discard(name)
+        return
+    if attr == "collections":
+        if _state["unpaired"] is None:
+            _state["unpaired"] = {c.name for c in switch_registry.unpaired()}
+        if id_block.users and name in _state["unpaired"]:
+            _dissolve(id_block, scene)
+            _owned[attr].discard(name)
+            return
+        if id_block.users == 0 or (not id_block.objects and not id_block.children):
+            switch_registry.discard_collection(name)
+            collection_graph.remove(id_block)
+            _owned[attr].discard(name)
+        return
+    if id_block.users == 0:
+        data.remove(id_block)
+        _owned[attr].discard(name)
+
+def _busy():
+    is_job_running = getattr(bpy.app, "is_job_running", None)
+    if is_job_running and is_job_running('RENDER'):
+        return True
+    screen = bpy.context.screen
+    return bool(screen and screen.is_animation_playing)
+
+@diagnostics.instrument
+def _step():
+    scene = bpy.context.scene
+    if scene is None:
+        return None
+    if _busy():
+        return SLICE_INTERVAL
+    deadline = time.perf_counter() + SLICE_BUDGET
+    while _queue:
+        attr, name = _queue.popleft()
+        try:
+            _collect(attr, name, scene)
+        except (ReferenceError, RuntimeError):
+            pass
+        if time.perf_counter() >= deadline:
+            return SLICE_INTERVAL
+    _state["unpaired"] = None
+    return None
+
+def schedule():
+    if not _state["built"]:
+        rebuild()
+    if not _queue:
+        _state["unpaired"] = None
+        for attr, _ in _ID_TYPES:
+            _queue.extend((attr, name) for name in sorted(_owned[attr]))
+    if bpy.app.background:
+        scene = bpy.context.scene
+        while _queue:
+            attr, name = _queue.popleft()
+            try:
+                _collect(attr, name, scene)
+            except (ReferenceError, RuntimeError):
+                pass
+        _state["unpaired"] = None
+        return
+    if not bpy.app.timers.is_registered(_step):
+        bpy.app.timers.register(_step, first_interval=START_DELAY)
+
+def unregister():
+    if bpy.app.timers.is_registered(_step):
+        bpy.app.timers.unregister(_step)
+    clear()
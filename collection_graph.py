@@ -0,0 +1,180 @@
+import bpy
+from collections import defaultdict, deque
+
+# Keys are name_full so a local override and the linked collection it was
+# made from ("Figure" / "Figure [Default_Figure.blend]") never collide.
+_by_key = {}                      # key -> collection
+_parents = defaultdict(list)      # child key -> parent keys
+_scene_roots = defaultdict(set)   # child key -> scenes linking it at the top level
+_depth = {}                       # key -> depth below the scene collection
+_layer_maps = {}                  # (scene, view layer) -> {key: [LayerCollection]}
+_state = {"valid": False, "depth_valid": False}
+
+def _key(coll):
+    return coll.name_full
+
+def invalidate():
+    _state["valid"] = False
+    _state["depth_valid"] = False
+    _layer_maps.clear()
+
+def rebuild():
+    _by_key.clear()
+    _parents.clear()
+    _scene_roots.clear()
+    for coll in bpy.data.collections:
+        key = _key(coll)
+        _by_key[key] = coll
+        for child in coll.children:
+            _parents[_key(child)].append(key)
+    for scene in bpy.data.scenes:
+        for child in scene.collection.children:
+            _scene_roots[_key(child)].add(scene.name)
+    _state["valid"] = True
+    _state["depth_valid"] = False
+
+def ensure():
+    if not _state["valid"]:
+        rebuild()
+
+def _compute_depth():
+    ensure()
+    _depth.clear()
+    queue = deque()
+    for scene in bpy.data.scenes:
+        for child in scene.collection.children:
+            key = _key(child)
+            if key not in _depth:
+                _depth[key] = 1
+                queue.append(child)
+    while queue:
+        coll = queue.popleft()
+        level = _depth[_key(coll)] + 1
+        for child in coll.children:
+            key = _key(child)
+            if key not in _depth:
+                _depth[key] = level
+                queue.append(child)
+    _state["depth_valid"] = True
+
+def get(key):
+    ensure()
+    coll = _by_key.get(key)
+    if coll is None:
+        return None
+    try:
+        coll.name
+    except ReferenceError:
+        _by_key.pop(key, None)
+        return None
+    return coll
+
+def parents(coll):
+    ensure()
+    return [p for p in map(get, _parents.get(_key(coll), ())) if p is not None]
+
+def is_scene_root(coll, scene):
+    ensure()
+    return scene.name in _scene_roots.get(_key(coll), ())
+
+def parent(coll, scene=None):
+    if scene is None:
+        scene = bpy.context.scene
+    if is_scene_root(coll, scene):
+        return scene.collection
+    found = parents(coll)
+    return found[0] if found else None
+
+def depth(coll):
+    if not _state["depth_valid"]:
+        _compute_depth()
+    return _depth.get(_key(coll), 0)
+
+def _scenes_of(master):
+    return [s.name for s in bpy.data.scenes if s.collection == master]
+
+def link_child(parent_coll, child):
+    parent_coll.children.link(child)
+    _state["depth_valid"] = False
+    _layer_maps.clear()
+    if not _state["valid"]:
+        return
+    key = _key(child)
+    _by_key[key] = child
+    if parent_coll.is_embedded_data:
+        _scene_roots[key].update(_scenes_of(parent_coll))
+    else:
+        _parents[key].append(_key(parent_coll))
+
+def unlink_child(parent_coll, child):
+    parent_coll.children.unlink(child)
+    _state["depth_valid"] = False
+    _layer_maps.clear()
+    if not _state["valid"]:
+        return
+    key = _key(child)
+    if parent_coll.is_embedded_data:
+        _scene_roots[key].difference_update(_scenes_of(parent_coll))
+    else:
+        names = _parents.get(key)
+        if names and _key(parent_coll) in names:
+            names.remove(_key(parent_coll))
+
+def unlink_from_parents(coll):
+    ensure()
+    key = _key(coll)
+    for scene_name in list(_scene_roots.get(key, ())):
+        scene = bpy.data.scenes.get(scene_name)
+        if scene and coll.name in scene.collection.children:
+            scene.collection.children.unlink(coll)
+    for p in parents(coll):
+        if coll.name in p.children:
+            p.children.unlink(coll)
+    _scene_roots.pop(key, None)
+    _parents.pop(key, None)
+    _state["depth_valid"] = False
+    _layer_maps.clear()
+
+def remove(coll):
+    unlink_from_parents(coll)
+    key = _key(coll)
+    for child in coll.children:
+        names = _parents.get(_key(child))
+        if names and key in names:
+            names.remove(key)
+    _by_key.pop(key, None)
+    bpy.data.collections.remove(coll)
+
+def rename(coll, new_name, mode='NEVER'):
+    ensure()
+    old = _key(coll)
+    coll.rename(new_name, mode=mode)
+    new = _key(coll)
+    if new == old:
+        return
+    _by_key.pop(old, None)
+    _by_key[new] = coll
+    if old in _parents:
+        _parents[new] = _parents.pop(old)
+    if old in _scene_roots:
+        _scene_roots[new] = _scene_roots.pop(old)
+    for child in coll.children:
+        names = _parents.get(_key(child), [])
+        for i, name in enumerate(names):
+            if name == old:
+                names[i] = new
+    _state["depth_valid"] = False
+    _layer_maps.clear()
+
+def layer_collections(view_layer, coll):
+    map_key = (view_layer.id_data.name, view_layer.name)
+    lmap = _layer_maps.get(map_key)
+    if lmap is None:
+        lmap = defaultdict(list)
+        stack = list(view_layer.layer_collection.children)
+        while stack:
+            lc = stack.pop()
+            lmap[_key(lc.collection)].append(lc)
+            stack.extend(lc.children)
+        _layer_maps[map_key] = lmap
+    return lmap.get(_key(coll), [])
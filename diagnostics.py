@@ -0,0 +1,205 @@
+import inspect
+import json
+import time
+import bpy
+from collections import deque
+from bpy.props import IntProperty, StringProperty
+from bpy.types import Operator, Panel
+
+SAMPLE_WINDOW = 512
+
+_settings = {"rate_limit": 30}
+_stats = {}
+
+class HandlerStats:
+    def __init__(self, name):
+        self.name = name
+        self.count = 0
+        self.total = 0.0
+        self.samples = deque(maxlen=SAMPLE_WINDOW)
+        self.depth = 0
+        self.max_depth = 0
+        self.recent = deque()
+        self.storms = 0
+        self.last_warning = 0.0
+
+    def enter(self):
+        self.depth += 1
+        if self.depth > self.max_depth:
+            self.max_depth = self.depth
+
+    def leave(self, started, elapsed):
+        self.depth -= 1
+        self.count += 1
+        self.total += elapsed
+        self.samples.append(elapsed)
+        self.recent.append(started)
+        calls = self.calls_last_second(started)
+        if calls > _settings["rate_limit"] and started - self.last_warning > 1.0:
+            self.last_warning = started
+            self.storms += 1
+            print(f"[3dlayout] {self.name} fired {calls} times in the last second")
+
+    def calls_last_second(self, now=None):
+        # Pruned on read as well, so a burst that has stopped drops out.
+        if now is None:
+            now = time.perf_counter()
+        recent = self.recent
+        while recent and now - recent[0] > 1.0:
+            recent.popleft()
+        return len(recent)
+
+    def p95(self):
+        if not self.samples:
+            return 0.0
+        ordered = sorted(self.samples)
+        return ordered[min(len(ordered) - 1, int(round(0.95 * (len(ordered) - 1))))]
+
+    def as_dict(self):
+        return {
+            "count": self.count,
+            "total_ms": self.total * 1000.0,
+            "mean_ms": self.total * 1000.0 / self.count if self.count else 0.0,
+            "p95_ms": self.p95() * 1000.0,
+            "max_depth": self.max_depth,
+            "calls_last_second": self.calls_last_second(),
+            "storms": self.storms,
+        }
+
+def stats(name):
+    st = _stats.get(name)
+    if st is None:
+        st = _stats[name] = HandlerStats(name)
+    return st
+
+def _timed(st, fn, args):
+    st.enter()
+    started = time.perf_counter()
+    try:
+        return fn(*args)
+    finally:
+        st.leave(started, time.perf_counter() - started)
+
+def instrument(fn):
+    # Blender checks the positional argument count of update callbacks and
+    # decides how many arguments to pass handlers from it, so the wrapper
+    # keeps the wrapped function's arity.
+    st = stats(fn.__name__)
+    nargs = fn.__code__.co_argcount
+    if fn.__code__.co_flags & inspect.CO_VARARGS or nargs > 2:
+        def wrapper(*args):
+            return _timed(st, fn, args)
+    elif nargs == 0:
+        def wrapper():
+            return _timed(st, fn, ())
+    elif nargs == 1:
+        def wrapper(a):
+            return _timed(st, fn, (a,))
+    elif nargs == 2:
+        def wrapper(a, b):
+            return _timed(st, fn, (a, b))
+    wrapper.__name__ = fn.__name__
+    wrapper.__qualname__ = fn.__qualname__
+    wrapper.__doc__ = fn.__doc__
+    wrapper.__dict__.update(fn.__dict__)
+    wrapper.__wrapped__ = fn
+    return wrapper
+
+def snapshot():
+    return {name: st.as_dict() for name, st in sorted(_stats.items())}
+
+def reset():
+    for name in list(_stats):
+        _stats[name] = HandlerStats(name)
+
+def update_rate_limit(self, context):
+    _settings["rate_limit"] = context.window_manager.handler_rate_limit
+
+class DIAGNOSTICS_OT_dump_handler_stats(Operator):
+    bl_idname = "wm.dump_handler_stats"
+    bl_label = "Dump Handler Stats"
+    bl_description = "Write handler and update-callback statistics to a JSON file."
+
+    filepath: StringProperty(name="File", subtype='FILE_PATH', default="3dlayout_handlers.json")
+
+    def execute(self, context):
+        path = bpy.path.abspath(self.filepath)
+        report = {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "rate_limit": _settings["rate_limit"],
+            "handlers": snapshot(),
+        }
+        try:
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(report, f, indent=2)
+        except OSError as e:
+            self.report({'ERROR'}, f"Failed to write {path}: {e}")
+            return {'CANCELLED'}
+        self.report({'INFO'}, f"Handler stats written to {path}")
+        return {'FINISHED'}
+
+    def invoke(self, context, event):
+        context.window_manager.fileselect_add(self)
+        return {'RUNNING_MODAL'}
+
+class DIAGNOSTICS_OT_reset_handler_stats(Operator):
+    bl_idname = "wm.reset_handler_stats"
+    bl_label = "Reset Handler Stats"
+
+    def execute(self, context):
+        reset()
+        return {'FINISHED'}
+
+class VIEW3D_PT_handler_diagnostics(Panel):
+    bl_label = "Diagnostics"
+    bl_space_type = 'VIEW_3D'
+    bl_region_type = 'UI'
+    bl_category = "Camera"
+    bl_options = {'DEFAULT_CLOSED'}
+
+    def draw(self, context):
+        layout = self.layout
+        layout.prop(context.window_manager, "handler_rate_limit", text="警告 (回/秒)")
+        row = layout.row(align=True)
+        row.operator("wm.dump_handler_stats", text="書き出し", icon='EXPORT')
+        row.operator("wm.reset_handler_stats", text="リセット", icon='X')
+
+        col = layout.column(align=True)
+        header = col.row()
+        header.label(text="Handler")
+        header.label(text="Count")
+        header.label(text="Total ms")
+        header.label(text="p95 ms")
+        header.label(text="Depth")
+        for name, st in sorted(_stats.items()):
+            if not st.count:
+                continue
+            row = col.row()
+            row.alert = st.calls_last_second() > _settings["rate_limit"]
+            row.label(text=name)
+            row.label(text=str(st.count))
+            row.label(text=f"{st.total * 1000.0:.1f}")
+            row.label(text=f"{st.p95() * 1000.0:.2f}")
+            row.label(text=str(st.max_depth))
+
+classes = (
+    DIAGNOSTICS_OT_dump_handler_stats,
+    DIAGNOSTICS_OT_reset_handler_stats,
+    VIEW3D_PT_handler_diagnostics,
+)
+
+def register():
+    for cls in classes:
+        bpy.utils.register_class(cls)
+    bpy.types.WindowManager.handler_rate_limit = IntProperty(
+        name="Rate Limit",
+        description="Warn when a handler or update callback fires more often than this per second",
+        default=30,
+        min=1,
+        update=update_rate_limit
+    )
+
+def unregister():
+    del bpy.types.WindowManager.handler_rate_limit
+    for cls in reversed(classes):
+        bpy.utils.unregister_class(cls)
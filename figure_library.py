@@ -0,0 +1,262 @@
+import json
+import os
+import queue
+import threading
+import bpy
+from collections import defaultdict
+from . import figure_thumbnails
+
+# Figure folders are scanned recursively on a worker thread. The result is
+# kept on disk per root as
+#   dirs:  relative dir  -> mtime
+#   files: relative path -> [mtime, size]
+# and a directory whose mtime has not changed is not listed again. Its
+# cached files are still stat'ed (editing a file in place does not touch the
+# directory), and its subdirectories are visited as before.
+# Figure_Item names are root-relative paths without ".blend", so files
+# directly under the root keep the names they had before.
+
+INDEX_VERSION = 1
+INDEX_FILE = "figure_index.json"
+POLL_INTERVAL = 0.1
+BATCH_SIZE = 64
+
+_state = {"job": None, "items_version": 0}
+_enum_cache = {"key": None, "items": []}
+
+def _index_path():
+    folder = bpy.utils.user_resource('CONFIG', path="3dlayout", create=True)
+    return os.path.join(folder, INDEX_FILE)
+
+def load_index(path=None):
+    path = path or _index_path()
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if data.get("version") != INDEX_VERSION:
+        return {}
+    return data.get("roots", {})
+
+def save_index(roots, path=None):
+    path = path or _index_path()
+    tmp = path + ".tmp"
+    try:
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"version": INDEX_VERSION, "roots": roots}, f)
+        os.replace(tmp, path)
+    except OSError as e:
+        print(f"[3dlayout] Failed to write figure index {path}: {e}")
+
+def _root_key(root):
+    return os.path.normcase(os.path.abspath(root))
+
+def _item_name(rel):
+    return rel[:-len(".blend")]
+
+def blend_path(root, name):
+    return os.path.join(root, *name.split("/")) + ".blend"
+
+def scan(root, cached, cancel=None, emit=None, progress=None):
+    old_dirs = cached.get("dirs", {})
+    old_files = cached.get("files", {})
+    files_in = defaultdict(list)
+    for rel in old_files:
+        files_in[rel.rpartition("/")[0]].append(rel)
+    subdirs_in = defaultdict(list)
+    for rel in old_dirs:
+        if rel:
+            subdirs_in[rel.rpartition("/")[0]].append(rel)
+
+    new_dirs = {}
+    new_files = {}
+    batch = []
+    stack = [""]
+    while stack:
+        if cancel is not None and cancel.is_set():
+            return None
+        rel_dir = stack.pop()
+        path = os.path.join(root, *rel_dir.split("/")) if rel_dir else root
+        try:
+            mtime = os.stat(path).st_mtime
+        except OSError:
+            continue
+        new_dirs[rel_dir] = mtime
+        if old_dirs.get(rel_dir) == mtime:
+            for rel in files_in[rel_dir]:
+                try:
+                    st = os.stat(os.path.join(root, *rel.split("/")))
+                except OSError:
+                    continue
+                new_files[rel] = [st.st_mtime, st.st_size]
+                batch.append(rel)
+            stack.extend(subdirs_in[rel_dir])
+        else:
+            try:
+                entries = list(os.scandir(path))
+            except OSError:
+                continue
+            for entry in entries:
+                if entry.name.startswith("."):
+                    continue
+                rel = f"{rel_dir}/{entry.name}" if rel_dir else entry.name
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(rel)
+                    elif entry.name.lower().endswith(".blend") and entry.is_file():
+                        st = entry.stat()
+                        new_files[rel] = [st.st_mtime, st.st_size]
+                        batch.append(rel)
+                except OSError:
+                    continue
+        if progress is not None:
+            progress["dirs"] = len(new_dirs)
+            progress["files"] = len(new_files)
+        if emit is not None and len(batch) >= BATCH_SIZE:
+            emit(batch)
+            batch = []
+    if emit is not None and batch:
+        emit(batch)
+    return {"dirs": new_dirs, "files": new_files}
+
+def _worker(job):
+    results = job["results"]
+    try:
+        entry = scan(
+            job["root"], job["cached"], job["cancel"],
+            emit=lambda batch: results.put(("batch", batch)),
+            progress=job["progress"]
+        )
+    except Exception as e:
+        results.put(("error", str(e)))
+        return
+    results.put(("done", entry))
+
+def is_scanning():
+    job = _state["job"]
+    return job is not None and not job["finished"]
+
+def progress():
+    return _state["job"]["progress"] if is_scanning() else {}
+
+def _touch_items():
+    _state["items_version"] += 1
+
+def _add_items(job, wm, names):
+    listed = job["listed"]
+    for name in names:
+        if name not in listed:
+            listed.add(name)
+            wm.figure_items.add().name = name
+    _touch_items()
+    if not wm.figure_list and wm.figure_items:
+        wm.figure_list = wm.figure_items[0].name
+
+def _finish(job, wm, entry):
+    names = sorted(_item_name(rel) for rel in entry["files"])
+    if [item.name for item in wm.figure_items] != names:
+        selected = wm.figure_list
+        wm.figure_items.clear()
+        for name in names:
+            wm.figure_items.add().name = name
+        _touch_items()
+        if selected in names:
+            wm.figure_list = selected
+        elif names:
+            wm.figure_list = names[0]
+    roots = load_index()
+    roots[job["key"]] = entry
+    save_index(roots)
+
+def _redraw():
+    for window in bpy.context.window_manager.windows:
+        for area in window.screen.areas:
+            if area.type == 'VIEW_3D':
+                area.tag_redraw()
+
+def _drain(job, wm):
+    results = job["results"]
+    while True:
+        try:
+            kind, payload = results.get_nowait()
+        except queue.Empty:
+            return False
+        if kind == "batch":
+            _add_items(job, wm, (_item_name(rel) for rel in payload))
+        elif kind == "done":
+            if payload is not None:
+                _finish(job, wm, payload)
+            job["finished"] = True
+            return True
+        else:
+            print(f"[3dlayout] Figure scan failed: {payload}")
+            job["finished"] = True
+            return True
+
+def _poll():
+    job = _state["job"]
+    if job is None or job["finished"]:
+        return None
+    done = _drain(job, bpy.context.window_manager)
+    _redraw()
+    return None if done else POLL_INTERVAL
+
+def cancel():
+    job = _state["job"]
+    if job is not None and not job["finished"]:
+        job["cancel"].set()
+        job["finished"] = True
+    if bpy.app.timers.is_registered(_poll):
+        bpy.app.timers.unregister(_poll)
+
+def start_scan(wm, root):
+    cancel()
+    key = _root_key(root)
+    cached = load_index().get(key, {})
+
+    figure_thumbnails.clear()
+
+    # Show what the index already knows right away; the scan then adds new
+    # files as it finds them and drops missing ones when it finishes.
+    wm.figure_items.clear()
+    job = _state["job"] = {
+        "root": root,
+        "key": key,
+        "cached": cached,
+        "cancel": threading.Event(),
+        "results": queue.Queue(),
+        "progress": {"dirs": 0, "files": 0},
+        "listed": set(),
+        "finished": False,
+    }
+    _add_items(job, wm, sorted(_item_name(rel) for rel in cached.get("files", {})))
+
+    if bpy.app.background:
+        job["results"].put(("done", scan(root, cached, progress=job["progress"])))
+        _drain(job, wm)
+        return
+    threading.Thread(target=_worker, args=(job,), daemon=True).start()
+    # Persistent so a file load during the scan does not drop the timer and
+    # leave the job unfinished.
+    bpy.app.timers.register(_poll, first_interval=POLL_INTERVAL, persistent=True)
+
+def enum_items(self, context):
+    # Cached so Blender keeps references to the strings between redraws.
+    wm = context.window_manager
+    items = wm.figure_items
+    key = (_state["items_version"], len(items), figure_thumbnails.version(), wm.figure_path)
+    if _enum_cache["key"] != key:
+        root = bpy.path.abspath(wm.figure_path)
+        enum = []
+        for i, item in enumerate(items):
+            path = blend_path(root, item.name)
+            icon = figure_thumbnails.icon_id(path, path) or 'FILE_BLEND'
+            enum.append((item.name, os.path.basename(item.name), item.name, icon, i))
+        _enum_cache["items"] = enum or [("", "None", "")]
+        _enum_cache["key"] = key
+    return _enum_cache["items"]
+
+def unregister():
+    cancel()
+    _state["job"] = None
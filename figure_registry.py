@@ -0,0 +1,77 @@
+import bpy
+
+# Figure collections (children of a cut holding an armature) per cut. Each
+# cut remembers whether each child is a figure; lookups only compare child
+# names and re-check children that were added or reported as updated, so
+# wm.override_items can be kept current without rescanning every object.
+
+_cuts = {}      # (scene name, cut collection name_full) -> {child name: is figure}
+_touched = set()
+
+def cut_collection(scene):
+    cam = scene.camera
+    if cam and cam.name in bpy.data.collections:
+        return bpy.data.collections[cam.name]
+    return scene.collection
+
+def _key(scene, cut):
+    return (scene.name, cut.name_full)
+
+def selected_armatures(context):
+    # Selected armatures plus the active one; the figures that height and
+    # pose tools act on.
+    objs = [o for o in context.selected_objects if o.type == 'ARMATURE']
+    active = context.active_object
+    if active and active.type == 'ARMATURE' and active not in objs:
+        objs.append(active)
+    return objs
+
+def is_figure(coll):
+    return any(o.type == 'ARMATURE' for o in coll.objects)
+
+def invalidate():
+    _cuts.clear()
+    _touched.clear()
+
+def touch(names):
+    _touched.update(names)
+
+def figures(scene):
+    cut = cut_collection(scene)
+    entry = _cuts.get(_key(scene, cut))
+    if entry is None:
+        entry = _cuts[_key(scene, cut)] = {c.name: is_figure(c) for c in cut.children}
+    else:
+        children = {c.name: c for c in cut.children}
+        for name in [n for n in entry if n not in children]:
+            del entry[name]
+        for name, child in children.items():
+            if name not in entry or name in _touched:
+                entry[name] = is_figure(child)
+    _touched.difference_update(entry)
+    return sorted(name for name, fig in entry.items() if fig)
+
+def add(scene, coll):
+    cut = cut_collection(scene)
+    entry = _cuts.get(_key(scene, cut))
+    if entry is not None:
+        entry[coll.name] = is_figure(coll)
+
+def discard(name):
+    for entry in _cuts.values():
+        entry.pop(name, None)
+
+def sync(wm, scene):
+    # Rewrites wm.override_items only when the figure set changed, and
+    # leaves override_index alone unless it fell off the end.
+    if not hasattr(wm, "override_items"):
+        return
+    names = figures(scene)
+    items = wm.override_items
+    if [item.name for item in items] == names:
+        return
+    items.clear()
+    for name in names:
+        items.add().name = name
+    if wm.override_index >= len(items) and items:
+        wm.override_index = len(items) - 1
@@ -0,0 +1,127 @@
+import hashlib
+import os
+import queue
+import struct
+import threading
+import bpy
+import bpy.utils.previews
+from . import blend_reader
+
+# Figure thumbnails come from each .blend's embedded preview. A worker
+# thread stats the file, reuses <cache>/<path hash>_<mtime>_<size>.png when
+# it exists and otherwise extracts the preview with blend_reader. A timer
+# hands finished files to the previews collection, which loads the image
+# lazily when the icon is first drawn. Drawing only ever looks up icon ids.
+
+POLL_INTERVAL = 0.2
+
+_state = {"previews": None, "worker": None, "version": 0}
+_requests = queue.Queue()
+_results = queue.Queue()
+_pending = set()
+_missing = set()
+
+def _cache_dir():
+    return bpy.utils.user_resource('CONFIG', path=os.path.join("3dlayout", "thumbnails"), create=True)
+
+def version():
+    return _state["version"]
+
+def _thumbnail_file(cache_dir, path):
+    st = os.stat(path)
+    digest = hashlib.sha1(os.path.normcase(os.path.abspath(path)).encode("utf-8")).hexdigest()
+    png = os.path.join(cache_dir, f"{digest}_{st.st_mtime_ns}_{st.st_size}.png")
+    if os.path.isfile(png):
+        return png
+    for old in os.listdir(cache_dir):
+        if old.startswith(digest + "_"):
+            try:
+                os.remove(os.path.join(cache_dir, old))
+            except OSError:
+                pass
+    thumbnail = blend_reader.read(path, want_thumbnail=True)["thumbnail"]
+    if thumbnail is None:
+        return None
+    tmp = png + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(blend_reader.thumbnail_png(thumbnail))
+    os.replace(tmp, png)
+    return png
+
+def _work(cache_dir):
+    while True:
+        key, path = _requests.get()
+        if key is None:
+            return
+        try:
+            png = _thumbnail_file(cache_dir, path)
+        except (OSError, blend_reader.BlendFileError, struct.error, ValueError):
+            png = None
+        _results.put((key, png))
+
+def _poll():
+    pcoll = _state["previews"]
+    if pcoll is None:
+        return None
+    changed = False
+    while True:
+        try:
+            key, png = _results.get_nowait()
+        except queue.Empty:
+            break
+        _pending.discard(key)
+        if png is None:
+            _missing.add(key)
+        elif key not in pcoll:
+            pcoll.load(key, png, 'IMAGE')
+        changed = True
+    if changed:
+        _state["version"] += 1
+        for window in bpy.context.window_manager.windows:
+            for area in window.screen.areas:
+                if area.type == 'VIEW_3D':
+                    area.tag_redraw()
+    return POLL_INTERVAL if _pending else None
+
+def icon_id(key, path):
+    # Returns 0 until the thumbnail is ready; the first call queues it.
+    pcoll = _state["previews"]
+    if pcoll is None:
+        return 0
+    preview = pcoll.get(key)
+    if preview is not None:
+        return preview.icon_id
+    if key in _pending or key in _missing:
+        return 0
+    worker = _state["worker"]
+    if worker is None or not worker.is_alive():
+        worker = threading.Thread(target=_work, args=(_cache_dir(),), daemon=True)
+        worker.start()
+        _state["worker"] = worker
+    _pending.add(key)
+    _requests.put((key, path))
+    if not bpy.app.timers.is_registered(_poll):
+        bpy.app.timers.register(_poll, first_interval=POLL_INTERVAL)
+    return 0
+
+def clear():
+    pcoll = _state["previews"]
+    if pcoll is not None:
+        pcoll.clear()
+    _missing.clear()
+    _state["version"] += 1
+
+def register():
+    _state["previews"] = bpy.utils.previews.new()
+
+def unregister():
+    if bpy.app.timers.is_registered(_poll):
+        bpy.app.timers.unregister(_poll)
+    if _state["worker"] is not None:
+        _requests.put((None, None))
+        _state["worker"] = None
+    _pending.clear()
+    _missing.clear()
+    if _state["previews"] is not None:
+        bpy.utils.previews.remove(_state["previews"])
+        _state["previews"] = None
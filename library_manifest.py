@@ -0,0 +1,109 @@
+import json
+import os
+import struct
+import bpy
+from collections import OrderedDict
+from . import blend_reader
+
+# Names of the datablocks a .blend offers for linking, cached by path and
+# validated against the file's mtime and size. Recently used manifests are
+# kept in memory; all of them are kept on disk up to DISK_ENTRIES.
+
+MANIFEST_VERSION = 1
+MANIFEST_FILE = "library_manifest.json"
+MEMORY_ENTRIES = 64
+DISK_ENTRIES = 2048
+
+FIELDS = ("collections", "objects", "armatures")
+
+_memory = OrderedDict()
+_disk = {"entries": None}
+
+def _manifest_path():
+    folder = bpy.utils.user_resource('CONFIG', path="3dlayout", create=True)
+    return os.path.join(folder, MANIFEST_FILE)
+
+def _key(path):
+    return os.path.normcase(os.path.abspath(bpy.path.abspath(path)))
+
+def _disk_entries():
+    entries = _disk["entries"]
+    if entries is None:
+        entries = OrderedDict()
+        try:
+            with open(_manifest_path(), "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("version") == MANIFEST_VERSION:
+                entries.update(data.get("entries", {}))
+        except (OSError, ValueError):
+            pass
+        _disk["entries"] = entries
+    return entries
+
+def _save_disk():
+    entries = _disk_entries()
+    while len(entries) > DISK_ENTRIES:
+        entries.popitem(last=False)
+    path = _manifest_path()
+    tmp = path + ".tmp"
+    try:
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"version": MANIFEST_VERSION, "entries": entries}, f)
+        os.replace(tmp, path)
+    except OSError as e:
+        print(f"[3dlayout] Failed to write library manifest {path}: {e}")
+
+def _remember(key, entry):
+    _memory[key] = entry
+    _memory.move_to_end(key)
+    while len(_memory) > MEMORY_ENTRIES:
+        _memory.popitem(last=False)
+
+def _read(path):
+    try:
+        info = blend_reader.read(path, want_thumbnail=False)
+        return {field: info[field] for field in FIELDS}
+    except (OSError, blend_reader.BlendFileError, struct.error, ValueError):
+        pass
+    with bpy.data.libraries.load(path, link=True) as (data_from, data_to):
+        return {field: list(getattr(data_from, field)) for field in FIELDS}
+
+def get(path):
+    key = _key(path)
+    st = os.stat(key)
+    stamp = [st.st_mtime, st.st_size]
+
+    entry = _memory.get(key)
+    if entry is not None and entry["stamp"] == stamp:
+        _memory.move_to_end(key)
+        return entry
+
+    # Disk hits are only taken once per session (memory serves the rest), so
+    # persisting the new recency order there is cheap.
+    entries = _disk_entries()
+    entry = entries.get(key)
+    if entry is None or entry.get("stamp") != stamp:
+        entry = _read(key)
+        entry["stamp"] = stamp
+        entries.pop(key, None)
+        entries[key] = entry
+        _save_disk()
+    elif next(reversed(entries)) != key:
+        entries.move_to_end(key)
+        _save_disk()
+    _remember(key, entry)
+    return entry
+
+def collections(path):
+    return [name for name in get(path)["collections"] if name]
+
+def forget(path=None):
+    if path is None:
+        _memory.clear()
+        _disk["entries"] = None
+        return
+    key = _key(path)
+    _memory.pop(key, None)
+    entries = _disk_entries()
+    if entries.pop(key, None) is not None:
+        _save_disk()
@@ -0,0 +1,99 @@
+import bpy
+
+# Data-level replacement for object.make_local / per-collection make_local
+# loops. The dependency set is gathered first, then every linked or
+# overridden ID in it is made local in a single pass, owners before the
+# data they use, so the local copies pick each other up. IDs that cannot be
+# localized are returned with the reason instead of being dropped silently.
+
+_ORDER = {
+    bpy.types.Collection: 0,
+    bpy.types.Object: 1,
+    bpy.types.Armature: 2,
+    bpy.types.Mesh: 2,
+    bpy.types.Curve: 2,
+    bpy.types.Material: 3,
+    bpy.types.Action: 4,
+}
+
+def _rank(id_block):
+    for cls, rank in _ORDER.items():
+        if isinstance(id_block, cls):
+            return rank
+    return 2
+
+def _action(id_block):
+    anim = getattr(id_block, "animation_data", None)
+    return anim.action if anim and anim.action else None
+
+def object_dependencies(obj):
+    deps = [obj]
+    action = _action(obj)
+    if action:
+        deps.append(action)
+    data = obj.data
+    if data is not None:
+        deps.append(data)
+        action = _action(data)
+        if action:
+            deps.append(action)
+        for mat in getattr(data, "materials", ()):
+            if mat:
+                deps.append(mat)
+    for slot in obj.material_slots:
+        if slot.link == 'OBJECT' and slot.material:
+            deps.append(slot.material)
+    return deps
+
+def gather(objects=(), collections=(), include_objects=True):
+    ids = []
+    seen = set()
+
+    def add(id_block):
+        if id_block not in seen:
+            seen.add(id_block)
+            ids.append(id_block)
+
+    stack = list(collections)
+    while stack:
+        coll = stack.pop()
+        if coll in seen:
+            continue
+        add(coll)
+        stack.extend(coll.children)
+        if include_objects:
+            for obj in coll.objects:
+                for dep in object_dependencies(obj):
+                    add(dep)
+    for obj in objects:
+        for dep in object_dependencies(obj):
+            add(dep)
+    return ids
+
+def needs_localize(id_block):
+    return bool(id_block.library or id_block.override_library)
+
+def localize(ids):
+    todo = sorted((i for i in ids if needs_localize(i)), key=_rank)
+    localized = []
+    skipped = []
+    for id_block in todo:
+        name = f"{type(id_block).__name__} '{id_block.name}'"
+        try:
+            local = id_block.make_local()
+        except (RuntimeError, ReferenceError, TypeError) as e:
+            skipped.append((name, str(e)))
+            continue
+        if needs_localize(local):
+            skipped.append((name, "still linked after make_local"))
+        else:
+            localized.append(local)
+    return localized, skipped
+
+def report(operator, skipped, localized=None, limit=5):
+    for name, reason in skipped[:limit]:
+        operator.report({'WARNING'}, f"Skipped {name}: {reason}")
+    if len(skipped) > limit:
+        operator.report({'WARNING'}, f"...and {len(skipped) - limit} more skipped")
+    if localized is not None:
+        operator.report({'INFO'}, f"Localized {len(localized)} data-blocks, skipped {len(skipped)}")
@@ -1,6 +1,7 @@
 import bpy
 import os
 import math
+import re
 import mathutils
 import uuid
 from bpy.app.handlers import persistent
@@ -18,178 +19,125 @@ from bpy.props import (
 )
 from bpy.types import PropertyGroup, UIList, Panel, Operator
 from mathutils import Vector
+from . import armature_height
+from . import cleanup
+from . import collection_graph
+from . import diagnostics
+from . import figure_registry
+from . import naming
+from . import resolution
+from . import switch_registry
+from . import visibility
+
+# Scenes whose camera set may have changed since camera_list was last built.
+_camera_list_dirty = set()
+_msgbus_owner = object()
+
+# Cut list display caches, per scene name. Row labels are dropped when a
+# camera is updated; the filter/sort result is keyed by a version that
+# bumps whenever camera_list is rebuilt.
+_row_cache = {}
+_list_version = {}
+_filter_cache = {}
+
+_DIGITS = re.compile(r"(\d+)")
+_SEQUENCE = re.compile(r"^(.+?)[_\-. ]+(?=\D*\d)")
+
+def natural_key(name):
+    parts = _DIGITS.split(name)
+    return tuple(int(p) if i % 2 else p.lower() for i, p in enumerate(parts))
+
+def sequence_prefix(name):
+    # "S01_C010_Camera" -> "S01"; names with a single numbered token
+    # ("C010_Camera") have no sequence.
+    m = _SEQUENCE.match(name)
+    return m.group(1) if m else ""
+
+def invalidate_cut_rows(scene_name=None, cam_name=None):
+    if scene_name is None:
+        caches = list(_row_cache.values())
+    else:
+        caches = [_row_cache.get(scene_name, {})]
+    for rows in caches:
+        if cam_name:
+            rows.pop(cam_name, None)
+        else:
+            rows.clear()
 
 def update_camera_list(scene):
-    cams = sorted(
-        (o for o in scene.objects if o.type == 'CAMERA'),
-        key=lambda c: c.name
-    )
+    names = sorted((o.name for o in scene.objects if o.type == 'CAMERA'), key=natural_key)
     col = scene.camera_list
-    col.clear()
-    for cam in cams:
-        item = col.add()
-        item.name = cam.name
+    if [item.name for item in col] != names:
+        col.clear()
+        for name in names:
+            item = col.add()
+            item.name = name
+        _list_version[scene.name] = _list_version.get(scene.name, 0) + 1
+        _filter_cache.pop(scene.name, None)
+        invalidate_cut_rows(scene.name)
     if scene.camera_index >= len(col):
         scene.camera_index = max(0, len(col) - 1)
+    _camera_list_dirty.discard(scene.name)
+
+@diagnostics.instrument
+def mark_camera_lists_dirty(*args):
+    _camera_list_dirty.update(scene.name for scene in bpy.data.scenes)
+
+def subscribe_camera_events():
+    bpy.msgbus.clear_by_owner(_msgbus_owner)
+    bpy.msgbus.subscribe_rna(
+        key=(bpy.types.Object, "name"),
+        owner=_msgbus_owner,
+        args=(),
+        notify=mark_camera_lists_dirty,
+    )
 
+@diagnostics.instrument
 def update_new_res_x(self, context):
+    if resolution.is_syncing():
+        return
     scene = context.scene
-    scene.render.resolution_x = scene.new_setting_res_x
-    if scene.lock_resolution_ratio:
-        scale = scene.new_setting_res_x / 1920
-        new_y = int(1080 * scale)
-        scene.new_setting_res_y = new_y
-        scene.render.resolution_y = new_y
+    x = scene.new_setting_res_x
+    y = int(1080 * x / 1920) if scene.lock_resolution_ratio else scene.render.resolution_y
+    resolution.set_render(scene, x, y)
 
+@diagnostics.instrument
 def update_new_res_y(self, context):
+    if resolution.is_syncing():
+        return
     scene = context.scene
-    scene.render.resolution_y = scene.new_setting_res_y
-    if scene.lock_resolution_ratio:
-        scale = scene.new_setting_res_y / 1080
-        new_x = int(1920 * scale)
-        scene.new_setting_res_x = new_x
-        scene.render.resolution_x = new_x
-
-def clean_unpaired_switch_collections():
-    from collections import defaultdict
-
-    scene = bpy.context.scene
-    prop_to_colls = defaultdict(list)
-
-    for coll in bpy.data.collections:
-        for key, val in coll.items():
-            if key.startswith("Switch Collection"):
-                prop_to_colls[(key, val)].append(coll)
-
-    unpaired = []
-    for (key, val), colls in prop_to_colls.items():
-        if len(colls) < 2:
-            unpaired.extend(colls)
-
-    for coll in unpaired:
-        parent = next((p for p in bpy.data.collections if coll.name in p.children), None)
-        target_parent = parent or bpy.context.scene.collection
-
-        for child in list(coll.children):
-            target_parent.children.link(child)
-            coll.children.unlink(child)
-
-        for obj in list(coll.objects):
-            if obj.name not in target_parent.objects:
-                target_parent.objects.link(obj)
-            coll.objects.unlink(obj)
-
-        for p in bpy.data.collections:
-            if coll.name in p.children:
-                p.children.unlink(coll)
-        if coll.name in bpy.context.scene.collection.children:
-            bpy.context.scene.collection.children.unlink(coll)
-
-        bpy.data.collections.remove(coll)
-    bpy.ops.outliner.orphans_purge(do_recursive=True)
-    
+    y = scene.new_setting_res_y
+    x = int(1920 * y / 1080) if scene.lock_resolution_ratio else scene.render.resolution_x
+    resolution.set_render(scene, x, y)
+
 @persistent
+@diagnostics.instrument
 def update_camera(self, context):
     
     scene = context.scene
-    for coll in bpy.data.collections:
-        keys = {
-            key
-            for o in coll.objects
-            for key in o.keys()
-            if key.startswith("Switch Collection")
-        }
-    key_to_cols = defaultdict(set)
-    key_to_objs = defaultdict(list)
-    for o in scene.objects:
-        for key in list(o.keys()):
-            if not key.startswith("Switch Collection"):
-                continue
-            for coll in o.users_collection:
-                key_to_cols[key].add(coll.name)
-            key_to_objs[key].append(o)
-            
-    for key, cols in key_to_cols.items():
+    for key, names in switch_registry.object_keys().items():
+        objs = [o for o in map(bpy.data.objects.get, names) if o and key in o]
+        cols = {coll.name for o in objs for coll in o.users_collection}
         if len(cols) < 2:
-            for o in key_to_objs[key]:
+            for o in objs:
                 del o[key]
+                switch_registry.discard_object_key(o.name, key)
     
     idx = scene.camera_index
-    cams = sorted(
-        (o for o in scene.objects if o.type == 'CAMERA'),
-        key=lambda c: c.name
-    )
-    if not (0 <= idx < len(cams)):
+    if not (0 <= idx < len(scene.camera_list)):
+        return
+    cam = bpy.data.objects.get(scene.camera_list[idx].name)
+    if not cam or cam.type != 'CAMERA':
         return
-    cam = cams[idx]
     scene.camera = cam
-    # 1
-    for o in scene.objects:
-        if o.name == "EyeLevelCircle":
-            continue
-        o.hide_set(True)
-        o.hide_viewport = True
-        o.hide_render = True
-    # 2
-    cam.hide_set(False)
-    cam.hide_viewport = False
-    cam.hide_render = False
-    # 3
-    active_coll = bpy.data.collections.get(cam.name)
-    if active_coll:
-        for o in active_coll.objects:
-            o.hide_set(False)
-            o.hide_viewport = False
-            o.hide_render = False
-    # 4
-    for coll in bpy.data.collections:
-        has_cam = any(o.type == 'CAMERA' for o in coll.objects)
-        if cam.name in coll.objects:
-            coll.hide_viewport = False
-            coll.hide_render = False
-        elif has_cam:
-            coll.hide_viewport = True
-            coll.hide_render = True
-    # 5
-    for coll in bpy.data.collections:
-        for key, val in coll.items():
-            if key.startswith("Switch Collection") and val == cam.name:
-                coll.hide_viewport = True
-                coll.hide_render = True
-                break
-            else:
-                coll.hide_viewport = False
-                coll.hide_render = False
-    # 6
-    for coll in bpy.data.collections:
-        has_prop_for_cam = any(
-            key.startswith("Switch Collection") and val == cam.name
-            for key, val in coll.items()
-        )
-        if not has_prop_for_cam:
-            for o in coll.objects:
-                o.hide_set(False)
-                o.hide_viewport = False
-                o.hide_render = False
-    # 7
-    book_prefix = f"{cam.name} Book"
-    for coll in bpy.data.collections:
-        if coll.name.startswith(book_prefix):
-            coll.hide_viewport = False
-            coll.hide_render   = False
-            for o in coll.objects:
-                o.hide_set(False)
-                o.hide_viewport = False
-                o.hide_render   = False
+    # 1-7
+    state = visibility.switch_cut(scene, cam, context.view_layer, scene.cut_switch_mode)
     # 8
-    res = getattr(cam, 'resolution_xy', None)
-    if res and len(res) == 2:
-        context.scene.render.resolution_x = res[0]
-        context.scene.render.resolution_y = res[1]
-        context.scene.new_setting_res_x = res[0]
-        context.scene.new_setting_res_y = res[1]
+    res = state.resolution
+    if res:
+        resolution.set_render(scene, res[0], res[1])
     # 9
-    if cam.get("EyeLevel"):
+    if state.eye_level:
         circle = bpy.data.objects.get("EyeLevelCircle")
         if circle:
             for con in circle.constraints:
@@ -201,49 +149,138 @@ def update_camera(self, context):
     else:
         EyeLevel_remove_circle()
     # 10
-    for area in bpy.context.screen.areas:
+    screen = bpy.context.screen
+    for area in (screen.areas if screen else ()):
         if area.type == 'VIEW_3D':
             area.tag_redraw()
     
-    for coll in list(bpy.data.collections):
-        if not coll.objects and not coll.children:
-            bpy.data.collections.remove(coll)
-    
-    scene.switch_coll_list.clear()
-    root = bpy.data.collections.get(cam.name)
-    if root:
-        def scan(coll):
-            if any(key.startswith("Switch Collection") for o in coll.objects for key in o.keys()):
-                item = scene.switch_coll_list.add()
-                item.name = coll.name
-            for child in coll.children:
-                scan(child)
-        scan(root)
     bpy.ops.scene.refresh_switch_list()
-    clean_unpaired_switch_collections()
+    figure_registry.sync(context.window_manager, scene)
+    cleanup.schedule()
+
+CUT_SWITCH_DELAY = 0.15
+_pending_cut = {}
+
+@diagnostics.instrument
+def _apply_pending_cut():
+    scene = bpy.data.scenes.get(_pending_cut.pop("scene", ""))
+    if scene is None:
+        return None
+    window = next(
+        (w for w in bpy.context.window_manager.windows if w.scene == scene),
+        None
+    )
+    if window is None:
+        return None
+    with bpy.context.temp_override(
+        window=window,
+        screen=window.screen,
+        scene=scene,
+        view_layer=window.view_layer
+    ):
+        update_camera(None, bpy.context)
+    return None
+
+@diagnostics.instrument
+def update_camera_index(self, context):
+    # Scrubbing the list only moves the highlight; the cut itself is
+    # applied once the selection has settled.
+    if bpy.app.background:
+        update_camera(self, context)
+        return
+    _pending_cut["scene"] = context.scene.name
+    if bpy.app.timers.is_registered(_apply_pending_cut):
+        bpy.app.timers.unregister(_apply_pending_cut)
+    bpy.app.timers.register(_apply_pending_cut, first_interval=CUT_SWITCH_DELAY)
+
+@diagnostics.instrument
+def update_cut_switch_mode(self, context):
+    visibility.invalidate(context.scene)
+    update_camera(self, context)
 
 class Camera_Item(PropertyGroup):
     name: StringProperty(name="Camera Name")
 
+def _cut_row(scene, name):
+    rows = _row_cache.setdefault(scene.name, {})
+    row = rows.get(name)
+    if row is None:
+        cam = bpy.data.objects.get(name)
+        if not cam or cam.type != 'CAMERA':
+            return None
+        res = getattr(cam, 'resolution_xy', None)
+        if res and len(res) == 2:
+            label = f"{cam.name} ({res[0]}×{res[1]})"
+        else:
+            label = cam.name
+        row = rows[name] = (label, sequence_prefix(name))
+    return row
+
 class VIEW3D_PT_camera_list(UIList):
+    use_group_sequence: BoolProperty(
+        name="シーケンスでまとめる",
+        description="Group cuts by their sequence prefix",
+        default=False
+    )
+
     def draw_item(
         self, context, layout, data, item,
         icon, active_data, active_propname, index
     ):
-        cam = bpy.data.objects.get(item.name)
-        if not cam or cam.type != 'CAMERA':
-            return
         scene = context.scene
-        icon_id = (
-            'RADIOBUT_ON' if scene.camera == cam else 'RADIOBUT_OFF'
+        row = _cut_row(scene, item.name)
+        if row is None:
+            return
+        label, seq = row
+        active = scene.camera is not None and scene.camera.name == item.name
+        icon_id = 'RADIOBUT_ON' if active else 'RADIOBUT_OFF'
+        if self.use_group_sequence:
+            split = layout.split(factor=0.25)
+            split.label(text=seq)
+            split.label(text=label, icon=icon_id)
+        else:
+            layout.label(text=label, icon=icon_id)
+
+    def draw_filter(self, context, layout):
+        row = layout.row(align=True)
+        row.prop(self, "filter_name", text="")
+        row.prop(self, "use_filter_invert", text="", icon='ARROW_LEFTRIGHT')
+        row.prop(self, "use_filter_sort_reverse", text="", icon='SORT_DESC')
+        row.prop(self, "use_group_sequence", text="", icon='OUTLINER_COLLECTION')
+
+    def filter_items(self, context, data, propname):
+        items = getattr(data, propname)
+        scene_name = data.name
+        signature = (
+            _list_version.get(scene_name, 0),
+            len(items),
+            self.filter_name,
+            self.use_filter_sort_reverse,
+            self.use_group_sequence,
         )
-        res = getattr(cam, 'resolution_xy', None)
-        if res and len(res) == 2:
-            name = f"{cam.name} ({res[0]}×{res[1]})"
+        cached = _filter_cache.get(scene_name)
+        if cached and cached[0] == signature:
+            return cached[1], cached[2]
+
+        names = [item.name for item in items]
+        flags = [self.bitflag_filter_item] * len(names)
+        needle = self.filter_name.strip().lower()
+        if needle:
+            flags = [
+                self.bitflag_filter_item if needle in n.lower() else 0
+                for n in names
+            ]
+        if self.use_group_sequence:
+            key = lambda i: (natural_key(sequence_prefix(names[i])), natural_key(names[i]))
         else:
-            name = cam.name
-        layout.label(text=name, icon=icon_id)
-        
+            key = lambda i: natural_key(names[i])
+        ranked = sorted(range(len(names)), key=key, reverse=self.use_filter_sort_reverse)
+        order = [0] * len(names)
+        for pos, i in enumerate(ranked):
+            order[i] = pos
+        _filter_cache[scene_name] = (signature, flags, order)
+        return flags, order
+
 class Switch_collections_Item(PropertyGroup):
     name: StringProperty(name="Collection Name")
 
@@ -266,6 +303,9 @@ class VIEW3D_PT_camera_switcher(Panel):
             scene, "camera_index",
             rows=8
         )
+        row = layout.row(align=True)
+        row.prop(scene, "cut_switch_mode", expand=True)
+        row.operator("scene.build_cut_snapshots", text="", icon='FILE_REFRESH')
         layout.separator()
         layout.operator("object.separate_objects", text="Book 作成")
         layout.operator("object.copy_layer", text="Layer 複製")
@@ -299,18 +339,30 @@ class OBJECT_refresh_switch_list(Operator):
             self.report({'WARNING'}, f"Not found {cam.name} camera collection")
             return {'CANCELLED'}
 
+        keyed = {coll.name for coll in switch_registry.keyed(cam.name)}
+        if not keyed:
+            return {'FINISHED'}
+
         def scan(coll):
-            for key, val in coll.items():
-                if key.startswith("Switch Collection") and val == cam.name:
-                    item = scene.switch_coll_list.add()
-                    item.name = coll.name
-                    break
+            if coll.name in keyed:
+                item = scene.switch_coll_list.add()
+                item.name = coll.name
             for child in coll.children:
                 scan(child)
 
         scan(root)
         return {'FINISHED'}
 
+class OBJECT_build_cut_snapshots(Operator):
+    bl_idname = "scene.build_cut_snapshots"
+    bl_label = "Build Cut Snapshots"
+    bl_description = "Precompute the visibility snapshot of every cut so switching only applies stored state."
+
+    def execute(self, context):
+        count = visibility.build_snapshots(context.scene)
+        self.report({'INFO'}, f"{count} cut snapshots built")
+        return {'FINISHED'}
+
 class OBJECT_delete_switch_collection(Operator):
     bl_idname = "scene.delete_switch_collection"
     bl_label = "Delete"
@@ -327,12 +379,16 @@ class OBJECT_delete_switch_collection(Operator):
             self.report({'ERROR'}, f"{coll_name} is not found")
             return {'CANCELLED'}
         if coll.name in scene.collection.children:
-            scene.collection.children.unlink(coll)
+            collection_graph.unlink_child(scene.collection, coll)
         else:
-            for parent in bpy.data.collections:
-                if coll.name in parent.children:
-                    parent.children.unlink(coll)
-                    break
+            parent = collection_graph.parent(coll, scene)
+            if parent:
+                collection_graph.unlink_child(parent, coll)
+        if coll.users == 0:
+            switch_registry.discard_collection(coll.name)
+        if scene.camera:
+            visibility.invalidate_cut(scene, scene.camera.name)
+        cleanup.schedule()
         bpy.ops.scene.refresh_switch_list()
         return {'FINISHED'}
 
@@ -351,14 +407,17 @@ class OBJECT_copy_layer(Operator):
     def execute(self, context):
         cam = context.scene.camera
         src_coll = bpy.data.collections.get(cam.name)
-        new_root = bpy.data.collections.new(self.new_name)
+        new_name = naming.unique(("collections", "objects"), self.new_name)
+        if new_name != self.new_name:
+            self.report({'INFO'}, f"'{self.new_name}' は使用済みのため '{new_name}' で作成します")
+        new_root = bpy.data.collections.new(new_name)
         context.scene.collection.children.link(new_root)
         duplicate_collection(src_coll, new_root)
 
         for obj in new_root.objects:
             if obj.type == 'CAMERA':
-                obj.name = self.new_name
-                obj.data.name = self.new_name
+                obj.name = new_name
+                obj.data.name = naming.unique("cameras", new_name)
                 break
             
         context.view_layer.update()
@@ -376,14 +435,11 @@ def duplicate_collection(src, dest):
         obj_map[obj] = dup
 
     for child in src.children:
-        has_switch_prop = any(
-            key.startswith("Switch Collection") for key, val in child.items()
-        )
-        if has_switch_prop:
+        if switch_registry.has_keys(child):
             print(f"[SKIP] '{child.name}' は Switch Collection を持つため複製をスキップ")
             continue
 
-        dup_child = bpy.data.collections.new(child.name)
+        dup_child = bpy.data.collections.new(naming.allocate("collections", child.name))
         dest.children.link(dup_child)
         child_map = duplicate_collection(child, dup_child)
         obj_map.update(child_map)
@@ -529,11 +585,7 @@ class VIEW3D_PT_set_base_resolution(Operator):
     bl_label = "基準解像度 (1920x1080)"
 
     def execute(self, context):
-        scene = context.scene
-        scene.new_setting_res_x = 1920
-        scene.new_setting_res_y = 1080
-        scene.render.resolution_x = 1920
-        scene.render.resolution_y = 1080
+        resolution.set_render(context.scene, 1920, 1080)
         return {'FINISHED'}
 
 class VIEW3D_PT_resolution_settings(Panel):
@@ -575,11 +627,14 @@ class VIEW3D_PT_Camera_viewpoint_btn(Operator):
         return context.window_manager.invoke_props_dialog(self)
 
     def execute(self, context):
-        camera_data = bpy.data.cameras.new(name=self.camera_name)
-        cam_obj = bpy.data.objects.new(self.camera_name, camera_data)
-        col = bpy.data.collections.get(self.camera_name)
+        # An existing collection of the same name is the cut's and is reused;
+        # only an existing camera object forces a new name.
+        name = naming.unique("objects", self.camera_name)
+        camera_data = bpy.data.cameras.new(name=naming.unique("cameras", name))
+        cam_obj = bpy.data.objects.new(name, camera_data)
+        col = bpy.data.collections.get(name)
         if not col:
-            col = bpy.data.collections.new(self.camera_name)
+            col = bpy.data.collections.new(naming.unique("collections", name))
             context.scene.collection.children.link(col)
             
         col.objects.link(cam_obj)
@@ -616,7 +671,10 @@ class VIEW3D_PT_Camera_OverScan(Operator):
 
         return {'FINISHED'}
 
+@diagnostics.instrument
 def ResolutionUpdate(self, context):
+    if resolution.is_syncing():
+        return
     scene = context.scene
     overscan = scene.camera_overscan
     render = scene.render
@@ -626,6 +684,10 @@ def ResolutionUpdate(self, context):
     if not cam or cam.type != 'CAMERA':
         return
 
+    with resolution.syncing():
+        _apply_overscan(scene, overscan, render, cam_data)
+
+def _apply_overscan(scene, overscan, render, cam_data):
     if overscan.RO_Activate:
         if overscan.RO_Safe_SensorSize == -1:
             overscan.RO_Safe_Res_X = render.resolution_x
@@ -649,13 +711,11 @@ def ResolutionUpdate(self, context):
 
         elif factor_y > 1.0 and abs(factor_x - 0.5) < 0.01:
             cam_data.sensor_width *= factor_y
-        render.resolution_x = overscan.RO_Custom_Res_X
-        render.resolution_y = overscan.RO_Custom_Res_Y
+        resolution.set_render(scene, overscan.RO_Custom_Res_X, overscan.RO_Custom_Res_Y)
 
     else:
         if overscan.RO_Safe_SensorSize != -1:
-            render.resolution_x = overscan.RO_Safe_Res_X
-            render.resolution_y = overscan.RO_Safe_Res_Y
+            resolution.set_render(scene, int(overscan.RO_Safe_Res_X), int(overscan.RO_Safe_Res_Y))
             cam_data.sensor_width = overscan.RO_Safe_SensorSize
             cam_data.sensor_fit = overscan.RO_Safe_SensorFit
             overscan.RO_Safe_SensorSize = -1
@@ -968,8 +1028,6 @@ class OBJECT_separate_objects(bpy.types.Operator):
         return context.window_manager.invoke_props_dialog(self)
 
     def execute(self, context):
-        bpy.ops.outliner.orphans_purge(do_recursive=True)
-
         scene = context.scene
         cam = scene.camera
 
@@ -979,10 +1037,11 @@ class OBJECT_separate_objects(bpy.types.Operator):
             scene.collection.children.link(cam_col)
 
         book_col_name = f"{cam_col.name} Book {self.book_n}"
-        book_col = bpy.data.collections.get(book_col_name)
+        book_col = cleanup.reclaim_orphan(bpy.data.collections, book_col_name)
         if not book_col:
             book_col = bpy.data.collections.new(book_col_name)
-            cam_col.children.link(book_col)
+            collection_graph.link_child(cam_col, book_col)
+            cleanup.mark(book_col)
 
         count = 0
         for obj in context.selected_objects:
@@ -991,10 +1050,11 @@ class OBJECT_separate_objects(bpy.types.Operator):
                 parent_col = scene.collection 
 
             src_coll_name = obj.name
-            src_coll = bpy.data.collections.get(src_coll_name)
+            src_coll = cleanup.reclaim_orphan(bpy.data.collections, src_coll_name)
             if not src_coll:
                 src_coll = bpy.data.collections.new(src_coll_name)
-                parent_col.children.link(src_coll)
+                collection_graph.link_child(parent_col, src_coll)
+                cleanup.mark(src_coll)
 
             for c in obj.users_collection:
                 try:
@@ -1004,27 +1064,28 @@ class OBJECT_separate_objects(bpy.types.Operator):
             if obj.name not in src_coll.objects:
                 src_coll.objects.link(obj)
 
-            existing_idxs = sorted(
-                int(k.replace("Switch Collection", "").split('_')[0])
-                for k in src_coll.keys() if k.startswith("Switch Collection")
-            )
-            next_idx = existing_idxs[-1] + 1 if existing_idxs else 1
+            next_idx = switch_registry.next_index(src_coll)
             uid = uuid.uuid4().hex[:8]
-            prop_key = f"Switch Collection{next_idx}_{uid}"
+            prop_key = f"{switch_registry.SWITCH_PREFIX}{next_idx}_{uid}"
             src_coll[prop_key] = cam.name
+            switch_registry.add(src_coll, prop_key, cam.name)
 
             dup = obj.copy()
             if obj.data:
                 dup.data = obj.data.copy()
+                cleanup.mark(dup.data)
+            cleanup.mark(dup)
 
             book_col.objects.link(dup)
 
             if prop_key not in book_col.keys():
                 book_col[prop_key] = cam.name
+                switch_registry.add(book_col, prop_key, cam.name)
 
             if self.change_color:
-                mat = (dup.active_material.copy() if dup.active_material else bpy.data.materials.new(f"Mat_{dup.name}"))
+                mat = (dup.active_material.copy() if dup.active_material else bpy.data.materials.new(naming.unique("materials", f"Mat_{dup.name}")))
                 mat.diffuse_color = (*self.color, 1.0)
+                cleanup.mark(mat)
                 dup.data.materials.clear()
                 dup.data.materials.append(mat)
 
@@ -1032,13 +1093,15 @@ class OBJECT_separate_objects(bpy.types.Operator):
 
         if self.change_color:
             mat_name = f"Mat_{book_col.name}"
-            mat = bpy.data.materials.new(mat_name)
+            mat = bpy.data.materials.new(naming.unique("materials", mat_name))
             mat.diffuse_color = (*self.color, 1.0)
+            cleanup.mark(mat)
             for o in book_col.objects:
                 if hasattr(o.data, "materials"):
                     o.data.materials.clear()
                     o.data.materials.append(mat)
-                    
+
+        visibility.invalidate_cut(scene, cam.name)
         return {'FINISHED'}
 
 class WalkNavigation_Panel(bpy.types.Panel):
@@ -1252,115 +1315,120 @@ class VIEW3D_PT_Camera_apply_transform_from_bg(Operator):
             return 1.78 + (y - base_x) / (1900 - base_x) * (2.069 - 1.78)
 
     def execute(self, context):
-        scene = context.scene
-        camera = scene.camera
-        cam_data = camera.data
-        res_x = scene.render.resolution_x
-        res_y = scene.render.resolution_y
-        scene.use_nodes = True
-        tree  = scene.node_tree
-        nodes = tree.nodes
-        links = tree.links
-
-        if not tree.get("composite_setup_done", False):
-            for n in list(nodes):
-                nodes.remove(n)
-            rl = nodes.new(type='CompositorNodeRLayers')
-            rl.label    = 'Render Layers'
-            rl.location = (0, 0)
-
-            alpha_nodes = []
-            for i in range(1, 6):
-                x = 300 * i
-
-                img = nodes.new(type='CompositorNodeImage')
-                img.label    = f"{i}_Frame.png"
-                img.image    = bpy.data.images.get("Frame.png")
-                img.location = (x, 200)
-                tr = nodes.new(type='CompositorNodeTransform')
-                tr.label    = f"{i}_Frame Transform"
-                tr.location = (x, 0)
-                tr.filter_type  = "BICUBIC"
-                links.new(img.outputs['Image'], tr.inputs['Image'])
-                ao = nodes.new(type='CompositorNodeAlphaOver')
-                ao.label          = f"{i}_Alpha Over"
-                ao.use_premultiply = False
-                ao.premul = 1
-                ao.location = (x, -200)
-                ao.inputs[0].default_value = 1.0
-                links.new(tr.outputs['Image'],    ao.inputs[2])
-                links.new(rl.outputs['Image'],    ao.inputs[1])
-                alpha_nodes.append(ao)
-
-            mix_nodes = []
-            for m in range(1, 5):
-                mx = nodes.new(type='CompositorNodeMixRGB')
-                mx.label        = f"cmp{m}"
-                mx.blend_type   = 'DARKEN'
-                mx.inputs['Fac'].default_value = 1.0
-                mx.location     = (300 * m, -400)
-
-                src1 = alpha_nodes[m-1].outputs['Image'] if m == 1 else mix_nodes[-1].outputs['Image']
-                links.new(src1,mx.inputs[1])
-                links.new(alpha_nodes[m].outputs['Image'], mx.inputs[2])
-                mix_nodes.append(mx)
-
-            final = mix_nodes[-1].outputs['Image']
-            comp = nodes.new(type='CompositorNodeComposite')
-            comp.location = (1000, -400)
-            links.new(final, comp.inputs['Image'])
-
-            for idx, vx in enumerate((1200, 1400), start=1):
-                vw = nodes.new(type='CompositorNodeViewer')
-                vw.location = (vx, -400)
-                links.new(final, vw.inputs['Image'])
-        tree["composite_setup_done"] = True
-
-        max_frame_number = 6
-
-        for idx in range(max_frame_number):
-            prefix = str(idx + 1)
-
-            transform_node = next(
-                (n for n in nodes if n.type == 'TRANSFORM' and n.label == f"{prefix}_Frame Transform"), None)
-            alpha_node = next(
-                (n for n in nodes if n.type == 'ALPHAOVER' and n.label == f"{prefix}_Alpha Over"), None)
-
-            if not alpha_node:
-                continue
-
-            if idx < len(cam_data.background_images):
-                bg_image = cam_data.background_images[idx]
-                if bg_image.show_background_image:
-                    if not transform_node:
-                        self.report({'WARNING'}, f"Transform node number{prefix}could not be found.")
-                        continue
-
-                    offset_x = bg_image.offset[0]
-                    offset_y = bg_image.offset[1]
-                    scale = bg_image.scale
-                    alpha = bg_image.alpha
-
-                    px_offset_x = offset_x * res_x
-                    px_offset_y = (offset_y * res_x / 0.887) / 2
-
-                    base_scale = self.__class__.calculate_s(res_x, res_y)
-                    final_scale = base_scale * scale
-
-                    transform_node.inputs[1].default_value = px_offset_x
-                    transform_node.inputs[2].default_value = px_offset_y
-                    transform_node.inputs[4].default_value = final_scale
-                    alpha_node.inputs[0].default_value = alpha
-                else:
-                    alpha_node.inputs[0].default_value = 0.0
-            else:
-                alpha_node.inputs[0].default_value = 0.0
+        for prefix in setup_frame_compositor(context.scene):
+            self.report({'WARNING'}, f"Transform node number{prefix}could not be found.")
 
         bpy.ops.render.render(use_viewport=True)
         bpy.ops.render.view_show('INVOKE_DEFAULT')
         self.report({'INFO'}, "レンダリング完了")
         return {'FINISHED'}
 
+def setup_frame_compositor(scene):
+    camera = scene.camera
+    cam_data = camera.data
+    res_x = scene.render.resolution_x
+    res_y = scene.render.resolution_y
+    scene.use_nodes = True
+    tree  = scene.node_tree
+    nodes = tree.nodes
+    links = tree.links
+
+    if not tree.get("composite_setup_done", False):
+        for n in list(nodes):
+            nodes.remove(n)
+        rl = nodes.new(type='CompositorNodeRLayers')
+        rl.label    = 'Render Layers'
+        rl.location = (0, 0)
+
+        alpha_nodes = []
+        for i in range(1, 6):
+            x = 300 * i
+
+            img = nodes.new(type='CompositorNodeImage')
+            img.label    = f"{i}_Frame.png"
+            img.image    = bpy.data.images.get("Frame.png")
+            img.location = (x, 200)
+            tr = nodes.new(type='CompositorNodeTransform')
+            tr.label    = f"{i}_Frame Transform"
+            tr.location = (x, 0)
+            tr.filter_type  = "BICUBIC"
+            links.new(img.outputs['Image'], tr.inputs['Image'])
+            ao = nodes.new(type='CompositorNodeAlphaOver')
+            ao.label          = f"{i}_Alpha Over"
+            ao.use_premultiply = False
+            ao.premul = 1
+            ao.location = (x, -200)
+            ao.inputs[0].default_value = 1.0
+            links.new(tr.outputs['Image'],    ao.inputs[2])
+            links.new(rl.outputs['Image'],    ao.inputs[1])
+            alpha_nodes.append(ao)
+
+        mix_nodes = []
+        for m in range(1, 5):
+            mx = nodes.new(type='CompositorNodeMixRGB')
+            mx.label        = f"cmp{m}"
+            mx.blend_type   = 'DARKEN'
+            mx.inputs['Fac'].default_value = 1.0
+            mx.location     = (300 * m, -400)
+
+            src1 = alpha_nodes[m-1].outputs['Image'] if m == 1 else mix_nodes[-1].outputs['Image']
+            links.new(src1,mx.inputs[1])
+            links.new(alpha_nodes[m].outputs['Image'], mx.inputs[2])
+            mix_nodes.append(mx)
+
+        final = mix_nodes[-1].outputs['Image']
+        comp = nodes.new(type='CompositorNodeComposite')
+        comp.location = (1000, -400)
+        links.new(final, comp.inputs['Image'])
+
+        for idx, vx in enumerate((1200, 1400), start=1):
+            vw = nodes.new(type='CompositorNodeViewer')
+            vw.location = (vx, -400)
+            links.new(final, vw.inputs['Image'])
+    tree["composite_setup_done"] = True
+
+    max_frame_number = 6
+    missing = []
+
+    for idx in range(max_frame_number):
+        prefix = str(idx + 1)
+
+        transform_node = next(
+            (n for n in nodes if n.type == 'TRANSFORM' and n.label == f"{prefix}_Frame Transform"), None)
+        alpha_node = next(
+            (n for n in nodes if n.type == 'ALPHAOVER' and n.label == f"{prefix}_Alpha Over"), None)
+
+        if not alpha_node:
+            continue
+
+        if idx < len(cam_data.background_images):
+            bg_image = cam_data.background_images[idx]
+            if bg_image.show_background_image:
+                if not transform_node:
+                    missing.append(prefix)
+                    continue
+
+                offset_x = bg_image.offset[0]
+                offset_y = bg_image.offset[1]
+                scale = bg_image.scale
+                alpha = bg_image.alpha
+
+                px_offset_x = offset_x * res_x
+                px_offset_y = (offset_y * res_x / 0.887) / 2
+
+                base_scale = VIEW3D_PT_Camera_apply_transform_from_bg.calculate_s(res_x, res_y)
+                final_scale = base_scale * scale
+
+                transform_node.inputs[1].default_value = px_offset_x
+                transform_node.inputs[2].default_value = px_offset_y
+                transform_node.inputs[4].default_value = final_scale
+                alpha_node.inputs[0].default_value = alpha
+            else:
+                alpha_node.inputs[0].default_value = 0.0
+        else:
+            alpha_node.inputs[0].default_value = 0.0
+    return missing
+
 # ---------------------------------------------------
 # Registration of custom properties
 # ---------------------------------------------------
@@ -1371,7 +1439,17 @@ def register_props():
         name="Camera Index",
         default=0,
         min=0,
-        update=update_camera
+        update=update_camera_index
+    )
+    bpy.types.Scene.cut_switch_mode = EnumProperty(
+        name="切り替え方式",
+        description="How a cut switch hides the other cuts",
+        items=[
+            ('OBJECT', "オブジェクト", "Hide objects and collections one by one"),
+            ('LAYER', "レイヤー", "Exclude whole cut collections from the view layer"),
+        ],
+        default='OBJECT',
+        update=update_cut_switch_mode
     )
     bpy.types.Scene.new_setting_res_x = IntProperty(
         name="X",
@@ -1409,6 +1487,7 @@ def register_props():
 def unregister_props():
     del bpy.types.Scene.camera_list
     del bpy.types.Scene.camera_index
+    del bpy.types.Scene.cut_switch_mode
     del bpy.types.Scene.new_setting_res_x
     del bpy.types.Scene.new_setting_res_y
     del bpy.types.Object.resolution_xy
@@ -1428,6 +1507,7 @@ classes = (
     Switch_collections_list,
     OBJECT_refresh_switch_list, 
     OBJECT_delete_switch_collection,
+    OBJECT_build_cut_snapshots,
     OBJECT_copy_layer,
     VIEW3D_PT_camera_control,
     VIEW3D_PT_Camera_viewpoint_btn,
@@ -1456,23 +1536,74 @@ classes = (
 )
 
 @persistent
-def _depsgraph_handler(depsgraph):
+@diagnostics.instrument
+def _depsgraph_handler(dummy, depsgraph):
+    # Objects are added, removed or relinked through collections; plain
+    # transform edits never touch them, so drags skip the camera scan.
+    if depsgraph.id_type_updated('COLLECTION'):
+        collection_graph.invalidate()
+        switch_registry.clear()
+        naming.invalidate("collections")
+        mark_camera_lists_dirty()
+        figure_registry.touch(
+            u.id.name for u in depsgraph.updates
+            if isinstance(u.id, bpy.types.Collection)
+        )
+        if bpy.context.scene is not None:
+            figure_registry.sync(bpy.context.window_manager, bpy.context.scene)
+    if depsgraph.id_type_updated('ARMATURE'):
+        armature_height.invalidate(
+            u.id.original.name_full for u in depsgraph.updates
+            if isinstance(u.id, bpy.types.Armature)
+        )
+    for id_type, attr in (('MATERIAL', "materials"), ('CAMERA', "cameras")):
+        if depsgraph.id_type_updated(id_type):
+            naming.invalidate(attr)
+    if depsgraph.id_type_updated('OBJECT'):
+        naming.invalidate("objects")
+        for update in depsgraph.updates:
+            obj = update.id
+            if isinstance(obj, bpy.types.Object) and obj.type == 'CAMERA':
+                invalidate_cut_rows(cam_name=obj.name)
     for scene in bpy.data.scenes:
-        update_camera_list(scene)
-        scene.new_setting_res_x = scene.render.resolution_x
-        scene.new_setting_res_y = scene.render.resolution_y
-        cam = scene.camera
-        if cam and hasattr(cam, "resolution_xy"):
-            cam.resolution_xy = (
-                scene.render.resolution_x,
-                scene.render.resolution_y
-            )
-        ov = getattr(scene, "camera_overscan", None)
-        if ov and ov.RO_Activate:
-            ov.RO_Custom_Res_X = scene.render.resolution_x
-            ov.RO_Custom_Res_Y = scene.render.resolution_y
+        if scene.name in _camera_list_dirty:
+            update_camera_list(scene)
+        resolution.push_render(scene)
         
+@persistent
+@diagnostics.instrument
+def _load_post_handler(dummy):
+    subscribe_camera_events()
+    armature_height.invalidate()
+    figure_registry.invalidate()
+    naming.invalidate()
+    mark_camera_lists_dirty()
+    invalidate_cut_rows()
+    _filter_cache.clear()
+    resolution.forget()
+    collection_graph.invalidate()
+    switch_registry.rebuild()
+    cleanup.rebuild()
+    visibility.invalidate()
+
+@persistent
+@diagnostics.instrument
+def _undo_post_handler(scene):
+    armature_height.invalidate()
+    figure_registry.invalidate()
+    naming.invalidate()
+    mark_camera_lists_dirty()
+    invalidate_cut_rows()
+    _filter_cache.clear()
+    resolution.forget()
+    collection_graph.invalidate()
+    switch_registry.clear()
+    cleanup.clear()
+    visibility.invalidate()
+
+@diagnostics.instrument
 def _deferred_init():
+    switch_registry.rebuild()
     for scene in bpy.data.scenes:
         update_camera_list(scene)
     return None
@@ -1481,12 +1612,27 @@ def register():
     for cls in classes:
         bpy.utils.register_class(cls)
     register_props()
+    resolution.register()
     bpy.app.handlers.depsgraph_update_post.append(_depsgraph_handler)
+    bpy.app.handlers.load_post.append(_load_post_handler)
+    bpy.app.handlers.undo_post.append(_undo_post_handler)
+    bpy.app.handlers.redo_post.append(_undo_post_handler)
+    subscribe_camera_events()
     bpy.app.timers.register(_deferred_init, first_interval=0.1)
 
 def unregister():
+    if bpy.app.timers.is_registered(_apply_pending_cut):
+        bpy.app.timers.unregister(_apply_pending_cut)
+    cleanup.unregister()
+    resolution.unregister()
+    bpy.msgbus.clear_by_owner(_msgbus_owner)
     if _depsgraph_handler in bpy.app.handlers.depsgraph_update_post:
         bpy.app.handlers.depsgraph_update_post.remove(_depsgraph_handler)
+    if _load_post_handler in bpy.app.handlers.load_post:
+        bpy.app.handlers.load_post.remove(_load_post_handler)
+    for handlers in (bpy.app.handlers.undo_post, bpy.app.handlers.redo_post):
+        if _undo_post_handler in handlers:
+            handlers.remove(_undo_post_handler)
     unregister_props()
     for cls in reversed(classes):
         bpy.utils.unregister_class(cls)
@@ -1,24 +1,50 @@
 import bpy
 import os
-from bpy.props import StringProperty, EnumProperty, CollectionProperty, IntProperty
+from bpy.props import StringProperty, EnumProperty, CollectionProperty, IntProperty, BoolProperty, FloatProperty
 from bpy.types import PropertyGroup, Operator, Panel, UIList
+from mathutils import Vector
+from . import armature_height
+from . import collection_graph
+from . import diagnostics
+from . import figure_library
+from . import figure_registry
+from . import figure_thumbnails
+from . import library_manifest
+from . import localize
+from . import naming
+from . import pose_tools
 
 def filter_top_level(imported):
-    top = []
-    for col in imported:
-        if not any(col.name in [c.name for c in parent.children] for parent in imported):
-            top.append(col)
-    for col in imported:
-        if col not in top:
-            try:
-                for parent in bpy.data.collections:
-                    if col in parent.children:
-                        parent.children.unlink(col)
-                bpy.data.collections.remove(col)
-            except Exception:
-                pass
+    names = {col.name_full for col in imported}
+    nested = {
+        child.name_full
+        for col in imported
+        for child in col.children
+        if child.name_full in names
+    }
+    top = [col for col in imported if col.name_full not in nested]
+    # Linked children stay inside their linked parents; appended copies
+    # that also landed in the scene are dropped as before.
+    local = [col for col in imported if col.name_full in nested and not col.library]
+    if local:
+        collection_graph.invalidate()
+    for col in local:
+        try:
+            collection_graph.remove(col)
+        except Exception:
+            pass
     return top
 
+def link_collections(blend_path, names):
+    # One library read for the whole set instead of a wm.link per name;
+    # nothing is instanced, callers link the top-level ones themselves.
+    names = [n for n in names if n]
+    if not names:
+        return []
+    with bpy.data.libraries.load(blend_path, link=True, relative=True) as (data_from, data_to):
+        data_to.collections = names
+    return [col for col in data_to.collections if col is not None]
+
 def find_layer_collection(layer_coll, target_name):
     if layer_coll.collection.name == target_name:
         return layer_coll
@@ -65,14 +91,8 @@ class Figure_OT_setup(Operator):
     def execute(self, context):
         wm = context.window_manager
         blend_folder = bpy.path.abspath(wm.figure_path)
-        wm.figure_items.clear()
         if os.path.isdir(blend_folder):
-            for f in sorted(os.listdir(blend_folder)):
-                if f.lower().endswith('.blend'):
-                    item = wm.figure_items.add()
-                    item.name = os.path.splitext(f)[0]
-            if wm.figure_items:
-                wm.figure_list = wm.figure_items[0].name
+            figure_library.start_scan(wm, blend_folder)
             return {'FINISHED'}
         else:
             self.report({'ERROR'}, "Invalid folder path")
@@ -86,20 +106,15 @@ class Figure_OT_refresh_override_list(Operator):
         wm = context.window_manager
         wm.override_items.clear()
 
-        cam = context.scene.camera
-        cam_coll = bpy.data.collections.get(cam.name) if cam and cam.name in bpy.data.collections else context.scene.collection
-
-        names = []
-        for col in cam_coll.children:
-            if any(o.type == 'ARMATURE' for o in col.objects):
-                names.append(col.name)
-        for name in sorted(names):
+        figure_registry.invalidate()
+        for name in figure_registry.figures(context.scene):
             item = wm.override_items.add()
             item.name = name
 
         wm.override_index = 0
         return {'FINISHED'}
 
+@diagnostics.instrument
 def override_selection_update(self, context):
     wm = context.window_manager
     idx = wm.override_index
@@ -117,14 +132,37 @@ def override_selection_update(self, context):
             o.select_set(True)
             context.view_layer.objects.active = o
             active_arm = armatures[0]
-            wm.armature_height_cm = round(active_arm.dimensions.z * 100)
+            with armature_height.syncing():
+                wm.armature_height_cm = round(armature_height.measure(active_arm) * 100)
     else:
         for o in col.objects:
             o.select_set(True)
 
+FIGURE_INSTANCING = [
+    ('FULL', "編集可能", "Fully editable, localized copy of the figure"),
+    ('SHARED', "共有メッシュ", "Posable armature per figure; meshes stay shared with the library"),
+    ('INSTANCE', "インスタンス", "Collection instance of the linked figure, no posing"),
+]
+
 class Figure_OT_add(Operator):
     bl_idname = "figure.add"
     bl_label = "Add Figure"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    count: IntProperty(name="数", default=1, min=1, max=500)
+    use_grid: BoolProperty(name="グリッド配置", default=False)
+    columns: IntProperty(name="列数", default=10, min=1)
+    spacing: FloatProperty(name="間隔", default=1.0, min=0.0, subtype='DISTANCE')
+    instancing: EnumProperty(name="方式", items=FIGURE_INSTANCING, default='FULL')
+
+    def grid_offset(self, i):
+        if not self.use_grid:
+            return None
+        return Vector((
+            (i % self.columns) * self.spacing,
+            (i // self.columns) * self.spacing,
+            0.0
+        ))
 
     def execute(self, context):
         wm = context.window_manager
@@ -137,39 +175,19 @@ class Figure_OT_add(Operator):
             if not name:
                 self.report({'ERROR'}, "No file selected in custom mode")
                 return {'CANCELLED'}
-            blend_path = os.path.join(bpy.path.abspath(wm.figure_path), name + ".blend")
-            
-        with bpy.data.libraries.load(blend_path, link=True) as (data_from, data_to):
-            col_names = data_from.collections[:]
-            
+            blend_path = figure_library.blend_path(bpy.path.abspath(wm.figure_path), name)
+
         if not os.path.isfile(blend_path):
             self.report({'ERROR'}, f"Blend file not found: {blend_path}")
             return {'CANCELLED'}
 
-        with bpy.data.libraries.load(blend_path, link=True) as (data_from, data_to):
-            col_names = data_from.collections[:]
+        try:
+            col_names = library_manifest.collections(blend_path)
+            imported = link_collections(blend_path, col_names)
+        except (OSError, RuntimeError) as e:
+            self.report({'ERROR'}, f"Failed to link {blend_path}: {e}")
+            return {'CANCELLED'}
 
-        imported = []
-        coll_dir = blend_path + "/Collection/"
-        for cname in col_names:
-            if not cname:
-                continue
-            try:
-                bpy.ops.wm.link(
-                    directory=coll_dir,
-                    filename=cname,
-                    relative_path=True,
-                    autoselect=False,
-                    active_collection=False,
-                    instance_collections=False,
-                    instance_object_data=True
-                )
-                col = bpy.data.collections.get(cname)
-                if col:
-                    imported.append(col)
-            except Exception as e:
-                self.report({'WARNING'}, f"Failed to link {cname}: {e}")
-        
         imported = filter_top_level(imported)
         cam = context.scene.camera
         if cam and cam.name in bpy.data.collections:
@@ -177,8 +195,9 @@ class Figure_OT_add(Operator):
         else:
             cam_coll = context.scene.collection
 
+        linked = {c.name_full for c in cam_coll.children}
         for col in imported:
-            if col.name not in [c.name for c in cam_coll.children]:
+            if col.name_full not in linked:
                 cam_coll.children.link(col)
 
         target_coll = bpy.data.collections.get(cam.name) if cam and cam.name in bpy.data.collections else context.scene.collection
@@ -199,35 +218,103 @@ class Figure_OT_add(Operator):
             if lc:
                 context.view_layer.active_layer_collection = lc
                 break  
-            
-        override_and_remove_collection()
-    
-        def localize_hierarchy(coll):
-            try:
-                coll.make_local()
-            except Exception:
-                pass
-            for child in coll.children:
-                localize_hierarchy(child)
 
-        root_coll = context.view_layer.active_layer_collection.collection
-        localize_hierarchy(root_coll)
+        source = context.view_layer.active_layer_collection.collection
+        if source.library and self.instancing == 'INSTANCE':
+            collection_graph.invalidate()
+            parent = collection_graph.parent(source, context.scene) or cam_coll
+            empties = add_collection_instances(source, parent, self.count)
+            collection_graph.unlink_from_parents(source)
+            for i, obj in enumerate(empties):
+                offset = self.grid_offset(i)
+                if offset is not None:
+                    obj.location += offset
+            figure_registry.sync(wm, context.scene)
+            return {'FINISHED'}
+
+        full = self.instancing == 'FULL'
+        overrides = []
+        if source.library:
+            overrides = override_collection_copies(
+                source, self.count, context.scene, context.view_layer,
+                do_fully_editable=full, remove_source=full
+            )
+        else:
+            print(f"'{source.name}' is not linked, skipping.")
+        if not overrides:
+            _, skipped = localize_hierarchy(context.view_layer.active_layer_collection.collection)
+            if skipped:
+                localize.report(self, skipped)
+            figure_registry.sync(wm, context.scene)
+            return {'FINISHED'}
 
+        skipped = []
+        for i, coll in enumerate(overrides):
+            if full:
+                skipped.extend(localize_hierarchy(coll)[1])
+            else:
+                make_armatures_editable(coll)
+            offset = self.grid_offset(i)
+            if offset is not None:
+                move_collection_roots(coll, offset)
+
+        if skipped:
+            localize.report(self, skipped)
+
+        for coll in overrides:
+            figure_registry.add(context.scene, coll)
+        figure_registry.sync(wm, context.scene)
+
+        lc = find_layer_collection(context.view_layer.layer_collection, overrides[-1].name)
+        if lc:
+            context.view_layer.active_layer_collection = lc
         return {'FINISHED'}
 
+    def invoke(self, context, event):
+        wm = context.window_manager
+        self.count = wm.figure_count
+        self.use_grid = wm.figure_use_grid
+        self.columns = wm.figure_grid_columns
+        self.spacing = wm.figure_grid_spacing
+        self.instancing = wm.figure_instancing
+        return self.execute(context)
+
+def localize_hierarchy(coll):
+    return localize.localize(localize.gather(collections=[coll], include_objects=False))
+
+def make_armatures_editable(coll):
+    # Shared figures stay system overrides so their meshes remain the
+    # linked ones; only the armature objects are opened up for posing.
+    for obj in coll.all_objects:
+        if obj.type == 'ARMATURE' and obj.override_library:
+            obj.override_library.is_system_override = False
+
+def is_instanced(coll):
+    users = bpy.data.user_map(subset=[coll], value_types={'OBJECT'}).get(coll, ())
+    return any(o.instance_collection == coll for o in users)
+
+def add_collection_instances(source, parent, count):
+    empties = []
+    for _ in range(count):
+        obj = bpy.data.objects.new(naming.allocate("objects", source.name), None)
+        obj.instance_type = 'COLLECTION'
+        obj.instance_collection = source
+        obj.empty_display_size = 0.25
+        parent.objects.link(obj)
+        empties.append(obj)
+    return empties
+
+def move_collection_roots(coll, offset):
+    objs = set(coll.all_objects)
+    for obj in objs:
+        if obj.parent is None or obj.parent not in objs:
+            obj.location += offset
+
+@diagnostics.instrument
 def update_armature_height(context):
-    obj = context.active_object
-    if obj and obj.type == 'ARMATURE':
-        target_cm = context.window_manager.armature_height_cm
-        if target_cm <= 0:
-            return
-        current_z = obj.dimensions.z
-        if current_z <= 0:
-            return
-        scale_factor = (target_cm / 100.0) / current_z
-        obj.scale *= scale_factor
-        bpy.context.view_layer.update()
-        bpy.ops.object.transforms_to_deltas(mode='ALL')
+    if armature_height.is_syncing():
+        return
+    armature_height.schedule(context, context.window_manager.armature_height_cm)
         
 class Figure_OT_override_list(UIList):
     def draw_item(self, context, layout, data, item, icon, active_data, active_propname, index):
@@ -252,8 +339,23 @@ class Figure_OT_panel(Panel):
         if wm.figure_mode == 'CUSTOM':
             layout.prop(wm, "figure_path")
             layout.operator("figure.setup", text="Set up")
+            if figure_library.is_scanning():
+                progress = figure_library.progress()
+                layout.label(
+                    text=f"スキャン中… {progress.get('files', 0)} files / {progress.get('dirs', 0)} folders",
+                    icon='TIME'
+                )
             if wm.figure_items:
+                layout.template_icon_view(wm, "figure_list", show_labels=True, scale=5.0, scale_popup=4.0)
                 layout.prop(wm, "figure_list", text="Select .blend")
+        layout.prop(wm, "figure_instancing", expand=True)
+        row = layout.row(align=True)
+        row.prop(wm, "figure_count", text="数")
+        row.prop(wm, "figure_use_grid", text="", icon='MESH_GRID')
+        if wm.figure_use_grid:
+            row = layout.row(align=True)
+            row.prop(wm, "figure_grid_columns", text="列数")
+            row.prop(wm, "figure_grid_spacing", text="間隔")
         layout.operator("figure.add", text="マネキンを追加")
         layout.separator()
         layout.label(text='List')
@@ -276,7 +378,7 @@ class Figure_OT_panel(Panel):
             row.operator("object.mode_set", text="オブジェクトモード").mode = 'OBJECT'
             layout.separator()
         
-            layout.label(text="身長")
+            layout.label(text=f"身長  (現在: {armature_height.measure(obj) * 100:.1f} cm)")
             layout.prop(context.window_manager, "armature_height_cm", text="身長 (cm)")
 
 def init_props():
@@ -299,10 +401,13 @@ def init_props():
     wm.figure_list = EnumProperty(
         name="Blend Files",
         description="Choose a .blend file",
-        items=lambda self, context: [
-            (item.name, item.name, "") for item in context.window_manager.figure_items
-        ] or [("", "None", "")],
+        items=figure_library.enum_items,
     )
+    wm.figure_instancing = EnumProperty(name="方式", items=FIGURE_INSTANCING, default='FULL')
+    wm.figure_count = IntProperty(name="数", default=1, min=1, max=500)
+    wm.figure_use_grid = BoolProperty(name="グリッド配置", default=False)
+    wm.figure_grid_columns = IntProperty(name="列数", default=10, min=1)
+    wm.figure_grid_spacing = FloatProperty(name="間隔", default=1.0, min=0.0, subtype='DISTANCE')
     wm.override_items = CollectionProperty(type=Override_Item)
     wm.override_index = IntProperty(name="Index", default=0, min=0, update=override_selection_update)
     wm.armature_height_cm = IntProperty(
@@ -316,7 +421,7 @@ def init_props():
 
 def clear_props():
     wm = bpy.types.WindowManager
-    for p in ['figure_mode','figure_path','figure_items','figure_list','override_items','override_index']:
+    for p in ['figure_mode','figure_path','figure_items','figure_list','figure_instancing','figure_count','figure_use_grid','figure_grid_columns','figure_grid_spacing','override_items','override_index']:
         if hasattr(wm,p): delattr(wm,p)
 
 def override_and_remove_collection(
@@ -336,47 +441,57 @@ def override_and_remove_collection(
         print(f"'{lc.name}' is not linked, skipping.")
         return False
 
+    return bool(override_collection_copies(lc, 1, scene, view_layer, do_fully_editable))
+
+def override_collection_copies(lc, count, scene, view_layer, do_fully_editable=True, remove_source=True):
+    # Creates count override hierarchies of the linked collection under its
+    # current parent, names them <name>_<n> from one sibling scan, and
+    # removes the linked collection once at the end (or just unlinks it
+    # when the overrides keep referencing it).
     original_name = lc.name
-    new_override = lc.override_hierarchy_create(
-        scene,
-        view_layer,
-        do_fully_editable=do_fully_editable
-    )
-    if not new_override:
-        new_override = scene.collection.children.get(original_name) \
-            or bpy.data.collections.get(original_name)
-    parent = None
-    
-    if new_override.name in [c.name for c in scene.collection.children]:
-        parent = scene.collection
-    else:
-        for col in bpy.data.collections:
-            if new_override.name in [c.name for c in col.children]:
-                parent = col
-                break
-    if parent is None:
-        parent = scene.collection
-
-    siblings = [c.name for c in parent.children if c is not new_override]
-
-    n = 1
-    while True:
-        cand = f"{original_name}_{n}"
-        if cand not in siblings:
+    collection_graph.invalidate()
+    target = collection_graph.parent(lc, scene) or scene.collection
+
+    overrides = []
+    for _ in range(count):
+        new_override = lc.override_hierarchy_create(
+            scene,
+            view_layer,
+            do_fully_editable=do_fully_editable
+        )
+        if not new_override:
+            new_override = scene.collection.children.get(original_name) \
+                or bpy.data.collections.get(original_name)
+        if not new_override or new_override in overrides:
             break
-        n += 1
-
-    new_override.rename(cand, mode='NEVER')
-
-    if original_name in [c.name for c in scene.collection.children]:
-        scene.collection.children.unlink(lc)
-    for col in bpy.data.collections:
-        if original_name in [c.name for c in col.children]:
-            col.children.unlink(lc)
-
-    bpy.data.collections.remove(lc)
+        overrides.append(new_override)
+    if not overrides:
+        return overrides
+
+    collection_graph.invalidate()
+    keys = {ov.name_full for ov in overrides}
+    for ov in overrides:
+        if not collection_graph.is_scene_root(ov, scene) and not collection_graph.parents(ov):
+            collection_graph.link_child(target, ov)
+        elif target is not scene.collection:
+            # Later copies no longer have lc in the hierarchy to replace and
+            # may be instanced elsewhere; keep them all next to the first.
+            if collection_graph.is_scene_root(ov, scene):
+                collection_graph.unlink_child(scene.collection, ov)
+            for p in collection_graph.parents(ov):
+                if p != target:
+                    collection_graph.unlink_child(p, ov)
+            if ov.name_full not in {c.name_full for c in target.children}:
+                collection_graph.link_child(target, ov)
+
+    for ov in overrides:
+        collection_graph.rename(ov, naming.allocate("collections", original_name), mode='NEVER')
+    if remove_source and not is_instanced(lc):
+        collection_graph.remove(lc)
+    else:
+        collection_graph.unlink_from_parents(lc)
 
-    return True
+    return overrides
 
 class Figure_OT_delete_override(Operator):
     bl_idname = "figure.delete_override"
@@ -401,7 +516,8 @@ class Figure_OT_delete_override(Operator):
         if cam_coll.children.get(name):
             cam_coll.children.unlink(coll)
         bpy.data.collections.remove(coll)
-        bpy.ops.figure.refresh_override_list()
+        figure_registry.discard(name)
+        figure_registry.sync(wm, context.scene)
         return {'FINISHED'}
 
 class Figure_OT_external_import(Operator):
@@ -416,25 +532,12 @@ class Figure_OT_external_import(Operator):
             self.report({'ERROR'}, f"File not found: {blend_path}")
             return {'CANCELLED'}
 
-        with bpy.data.libraries.load(blend_path, link=True) as (data_from, data_to):
-            col_names = data_from.collections[:]
-
-        imported = []
-        coll_dir = os.path.join(blend_path, "Collection") + os.sep
-        for name in col_names:
-            try:
-                bpy.ops.wm.link(
-                    directory=coll_dir,
-                    filename=name,
-                    relative_path=True,
-                    instance_collections=False,
-                    instance_object_data=True
-                )
-                col = bpy.data.collections.get(name)
-                if col:
-                    imported.append(col)
-            except Exception as e:
-                self.report({'WARNING'}, f"Failed to link {name}: {e}")
+        try:
+            col_names = library_manifest.collections(blend_path)
+            imported = link_collections(blend_path, col_names)
+        except (OSError, RuntimeError) as e:
+            self.report({'ERROR'}, f"Failed to link {blend_path}: {e}")
+            return {'CANCELLED'}
 
         imported = filter_top_level(imported)
         cam = context.scene.camera
@@ -443,8 +546,9 @@ class Figure_OT_external_import(Operator):
             if cam and cam.name in bpy.data.collections
             else context.scene.collection
         )
+        linked = {c.name_full for c in parent_coll.children}
         for col in imported:
-            if col.name not in [c.name for c in parent_coll.children]:
+            if col.name_full not in linked:
                 parent_coll.children.link(col)
 
         if imported:
@@ -459,17 +563,12 @@ class Figure_OT_external_import(Operator):
                     scene=context.scene,
                     view_layer=context.view_layer
                 )
-        def localize_hierarchy(coll):
-            try:
-                coll.make_local()
-            except Exception:
-                pass
-            for child in coll.children:
-                localize_hierarchy(child)
-
         root_coll = context.view_layer.active_layer_collection.collection
-        localize_hierarchy(root_coll)
+        _, skipped = localize_hierarchy(root_coll)
+        if skipped:
+            localize.report(self, skipped)
 
+        figure_registry.sync(context.window_manager, context.scene)
         return {'FINISHED'}
 
     def invoke(self, context, event):
@@ -487,8 +586,11 @@ class Figure_OT_append_import(Operator):
             self.report({'ERROR'}, f"File not found: {blend_path}")
             return {'CANCELLED'}
 
-        with bpy.data.libraries.load(blend_path, link=False) as (data_from, data_to):
-            all_names = data_from.collections[:]
+        try:
+            all_names = library_manifest.collections(blend_path)
+        except (OSError, RuntimeError) as e:
+            self.report({'ERROR'}, f"Failed to read {blend_path}: {e}")
+            return {'CANCELLED'}
 
         imported = []
         coll_dir = os.path.join(blend_path, "Collection") + os.sep
@@ -528,11 +630,9 @@ class Figure_OT_external_localize(Operator):
         return context.window_manager.invoke_props_dialog(self, width=350)
 
     def execute(self, context):
-        selected_objs = list(bpy.context.selected_objects)
-
-        for obj in selected_objs:
-            bpy.context.view_layer.objects.active = obj
-            bpy.ops.object.make_local(type='SELECT_OBDATA')
+        selected_objs = list(context.selected_objects)
+        localized, skipped = localize.localize(localize.gather(objects=selected_objs))
+        localize.report(self, skipped, localized)
 
         return {'FINISHED'}
 
@@ -578,31 +678,6 @@ class Figure_Panel(bpy.types.Panel):
         layout.operator("wm.paste_pose")
         layout.operator("wm.mirror_pose")
     
-def button1_callback(self):
-    bpy.ops.pose.select_all(action='DESELECT')
-    bpy.ops.pose.select_all(action='SELECT')
-    bpy.ops.pose.transforms_clear()
-    bpy.ops.pose.select_all(action='SELECT')
-    bpy.ops.pose.transforms_clear()
-    bpy.ops.pose.select_all(action='DESELECT')
-
-def button2_callback(self):
-    bpy.ops.pose.transforms_clear()
-    bpy.ops.pose.select_all(action='DESELECT')
-
-def button3_callback(self):
-    bpy.ops.pose.copy()
-    bpy.ops.pose.select_all(action='DESELECT')
-
-def button4_callback(self):
-    bpy.ops.pose.paste(flipped=False)
-    bpy.ops.pose.select_all(action='DESELECT')
-    
-def button5_callback(self):
-    bpy.ops.pose.copy()
-    bpy.ops.pose.paste(flipped=True)
-    bpy.ops.pose.select_all(action='DESELECT') 
-
 class GizmoToggleOperator(bpy.types.Operator):
     bl_idname = "object.gizmo_toggle_operator"
     bl_label = "Toggle Gizmo"
@@ -633,44 +708,64 @@ class VIEW3D_OT_SwitchAxis(bpy.types.Operator):
             bpy.context.scene.transform_orientation_slots[1].type = 'LOCAL'
         return {'FINISHED'}
 
-class All_Clear(bpy.types.Operator):
+class Pose_OT_base:
+    bl_options = {'REGISTER', 'UNDO'}
+
+    @classmethod
+    def poll(cls, context):
+        return bool(figure_registry.selected_armatures(context))
+
+class All_Clear(Pose_OT_base, bpy.types.Operator):
     bl_idname = "wm.all_clear"
     bl_label = "All_Clear"
 
     def execute(self, context):
-        button1_callback(None)
+        pose_tools.clear(figure_registry.selected_armatures(context))
         return {'FINISHED'}  
 
-class Select_Clear(bpy.types.Operator):
+class Select_Clear(Pose_OT_base, bpy.types.Operator):
     bl_idname = "wm.select_clear"
     bl_label = "Select_Clear"
 
     def execute(self, context):
-        button2_callback(None)
+        if not pose_tools.clear(figure_registry.selected_armatures(context), selected_only=True):
+            self.report({'WARNING'}, "No bones selected")
+            return {'CANCELLED'}
         return {'FINISHED'}  
     
-class Copy_Pose(bpy.types.Operator):
+class Copy_Pose(Pose_OT_base, bpy.types.Operator):
     bl_idname = "wm.copy_pose"
     bl_label = "Copy_Pose"
+    bl_options = {'REGISTER'}
 
     def execute(self, context):
-        button3_callback(None)
+        obj = context.active_object
+        if not (obj and obj.type == 'ARMATURE'):
+            obj = figure_registry.selected_armatures(context)[0]
+        count = pose_tools.copy(obj)
+        self.report({'INFO'}, f"{obj.name}: {count} bones copied")
         return {'FINISHED'}    
 
-class Paste_Pose(bpy.types.Operator):
+class Paste_Pose(Pose_OT_base, bpy.types.Operator):
     bl_idname = "wm.paste_pose"
     bl_label = "Paste_Pose"
 
+    @classmethod
+    def poll(cls, context):
+        return pose_tools.has_clipboard() and super().poll(context)
+
     def execute(self, context):
-        button4_callback(None)
+        if not pose_tools.paste(figure_registry.selected_armatures(context)):
+            self.report({'WARNING'}, "No matching bones to paste onto")
+            return {'CANCELLED'}
         return {'FINISHED'}
 
-class Mirror_Pose(bpy.types.Operator):
+class Mirror_Pose(Pose_OT_base, bpy.types.Operator):
     bl_idname = "wm.mirror_pose"
     bl_label = "Mirror_Pose"
 
     def execute(self, context):
-        button5_callback(None)
+        pose_tools.mirror(figure_registry.selected_armatures(context))
         return {'FINISHED'}
 
 classes = (
@@ -700,12 +795,16 @@ def register():
     for cls in classes:
         bpy.utils.register_class(cls)
     init_props()
+    figure_thumbnails.register()
     try:
         bpy.ops.figure.refresh_override_list()
     except RuntimeError as e:
         pass
     
 def unregister():
+    armature_height.unregister()
+    figure_library.unregister()
+    figure_thumbnails.unregister()
     clear_props()
     for cls in reversed(classes):
         bpy.utils.unregister_class(cls)
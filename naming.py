@@ -0,0 +1,93 @@
+import re
+import bpy
+
+# Name allocation for datablocks the addon creates. Each bpy.data
+# collection gets a name set and per-prefix counters ("<prefix>_<n>"),
+# built lazily in one pass and invalidated from the depsgraph, load and
+# undo handlers. Allocated names are reserved immediately, so a batch
+# never collides with itself and Blender never has to append ".001".
+
+_SUFFIX = re.compile(r"^(.*)_(\d+)$")
+
+_names = {}     # data attr -> set of names in use
+_counters = {}  # data attr -> {prefix: next n}
+
+def invalidate(attr=None):
+    if attr is None:
+        _names.clear()
+        _counters.clear()
+    else:
+        _names.pop(attr, None)
+        _counters.pop(attr, None)
+
+def _index(attr):
+    names = _names.get(attr)
+    if names is None:
+        names = _names[attr] = set(getattr(bpy.data, attr).keys())
+        counters = _counters[attr] = {}
+        for name in names:
+            m = _SUFFIX.match(name)
+            if m:
+                n = int(m.group(2)) + 1
+                if n > counters.get(m.group(1), 1):
+                    counters[m.group(1)] = n
+    return names
+
+def _taken(attrs, name):
+    # The cache only hears about other creations from the handlers, so names
+    # made earlier in the same operator (copy(), data.new with a fixed name)
+    # are checked against bpy.data too and folded in.
+    for attr in attrs:
+        names = _index(attr)
+        if name in names:
+            return True
+        if getattr(bpy.data, attr).get(name) is not None:
+            names.add(name)
+            return True
+    return False
+
+def is_free(attrs, name):
+    if isinstance(attrs, str):
+        attrs = (attrs,)
+    return not _taken(attrs, name)
+
+def reserve(attrs, name):
+    if isinstance(attrs, str):
+        attrs = (attrs,)
+    for attr in attrs:
+        _index(attr).add(name)
+
+def release(attrs, name):
+    if isinstance(attrs, str):
+        attrs = (attrs,)
+    for attr in attrs:
+        names = _names.get(attr)
+        if names is not None:
+            names.discard(name)
+
+def allocate(attrs, prefix):
+    # "<prefix>_<n>" with n one past the highest suffix seen for prefix.
+    if isinstance(attrs, str):
+        attrs = (attrs,)
+    n = max(_counters_for(attr).get(prefix, 1) for attr in attrs)
+    name = f"{prefix}_{n}"
+    while _taken(attrs, name):
+        n += 1
+        name = f"{prefix}_{n}"
+    for attr in attrs:
+        _counters[attr][prefix] = n + 1
+    reserve(attrs, name)
+    return name
+
+def unique(attrs, name):
+    # name itself when free, otherwise the next "<name>_<n>".
+    if isinstance(attrs, str):
+        attrs = (attrs,)
+    if not _taken(attrs, name):
+        reserve(attrs, name)
+        return name
+    return allocate(attrs, name)
+
+def _counters_for(attr):
+    _index(attr)
+    return _counters[attr]
@@ -0,0 +1,113 @@
+import bpy
+import numpy as np
+
+# Pose clear / copy / paste / mirror on pose.bones data. Channels are read
+# and written in bulk with foreach_get/foreach_set, so they work on every
+# selected figure from any mode and never touch the bone selection. The
+# selection only decides which bones are affected; with nothing selected
+# the whole figure is, except for clearing the selection, which then does
+# nothing.
+
+CHANNELS = (
+    ("location", (0.0, 0.0, 0.0)),
+    ("rotation_quaternion", (1.0, 0.0, 0.0, 0.0)),
+    ("rotation_euler", (0.0, 0.0, 0.0)),
+    ("rotation_axis_angle", (0.0, 0.0, 1.0, 0.0)),
+    ("scale", (1.0, 1.0, 1.0)),
+)
+
+_clipboard = {}   # bone name -> {channel: values}
+
+def read(obj):
+    bones = obj.pose.bones
+    arrays = {}
+    for attr, rest in CHANNELS:
+        values = np.empty(len(bones) * len(rest), dtype=np.float32)
+        bones.foreach_get(attr, values)
+        arrays[attr] = values.reshape(-1, len(rest))
+    return arrays
+
+def write(obj, arrays):
+    bones = obj.pose.bones
+    for attr, _rest in CHANNELS:
+        bones.foreach_set(attr, arrays[attr].ravel())
+    obj.update_tag(refresh={'DATA'})
+
+def selected(obj):
+    bones = obj.pose.bones
+    if hasattr(bpy.types.PoseBone, "select"):
+        mask = np.zeros(len(bones), dtype=bool)
+        bones.foreach_get("select", mask)
+        return mask
+    return np.fromiter((pb.bone.select for pb in bones), dtype=bool, count=len(bones))
+
+def affected(obj, selected_only=True):
+    mask = selected(obj) if selected_only else None
+    if mask is None or not mask.any():
+        return np.ones(len(obj.pose.bones), dtype=bool)
+    return mask
+
+def clear(objs, selected_only=False):
+    count = 0
+    for obj in objs:
+        mask = selected(obj) if selected_only else affected(obj, False)
+        if not mask.any():
+            continue
+        arrays = read(obj)
+        for attr, rest in CHANNELS:
+            arrays[attr][mask] = rest
+        write(obj, arrays)
+        count += int(mask.sum())
+    return count
+
+def copy(obj):
+    arrays = read(obj)
+    mask = affected(obj)
+    _clipboard.clear()
+    for i, pb in enumerate(obj.pose.bones):
+        if mask[i]:
+            _clipboard[pb.name] = {attr: arrays[attr][i].copy() for attr, _rest in CHANNELS}
+    return len(_clipboard)
+
+def has_clipboard():
+    return bool(_clipboard)
+
+def paste(objs):
+    count = 0
+    for obj in objs:
+        hits = [(i, _clipboard[pb.name]) for i, pb in enumerate(obj.pose.bones) if pb.name in _clipboard]
+        if not hits:
+            continue
+        arrays = read(obj)
+        for i, values in hits:
+            for attr, _rest in CHANNELS:
+                arrays[attr][i] = values[attr]
+        write(obj, arrays)
+        count += len(hits)
+    return count
+
+def flip(arrays):
+    # Mirror across the armature's X axis, as pose.paste(flipped=True) does.
+    flipped = {attr: values.copy() for attr, values in arrays.items()}
+    flipped["location"][:, 0] *= -1
+    flipped["rotation_quaternion"][:, 2:] *= -1
+    flipped["rotation_euler"][:, 1:] *= -1
+    flipped["rotation_axis_angle"][:, 2:] *= -1
+    return flipped
+
+def mirror(objs):
+    # The affected bones' poses are flipped onto their counterparts; a
+    # selected L/R pair swaps, a bone without a counterpart flips in place.
+    count = 0
+    for obj in objs:
+        names = [pb.name for pb in obj.pose.bones]
+        index = {name: i for i, name in enumerate(names)}
+        src = np.flatnonzero(affected(obj))
+        dst = np.array([index.get(bpy.utils.flip_name(names[i]), i) for i in src], dtype=np.intp)
+        arrays = read(obj)
+        flipped = flip({attr: values[src] for attr, values in arrays.items()})
+        for attr, _rest in CHANNELS:
+            arrays[attr][dst] = flipped[attr]
+        write(obj, arrays)
+        count += len(src)
+    return count
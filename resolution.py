@@ -0,0 +1,105 @@
+import bpy
+from bpy.app.handlers import persistent
+from contextlib import contextmanager
+from . import diagnostics
+
+# Binding between scene.render resolution, the panel values
+# (new_setting_res_x/y), the active camera's resolution_xy and the overscan
+# RO_Custom_Res_X/Y. Every write goes through _set, which skips equal values,
+# and happens inside syncing(), which the property update callbacks check so
+# one change never bounces back through the others.
+
+_state = {"depth": 0, "rendering": False}
+_last = {}  # scene name -> (res x, res y, camera name) last propagated
+
+def is_syncing():
+    return _state["depth"] > 0
+
+@contextmanager
+def syncing():
+    _state["depth"] += 1
+    try:
+        yield
+    finally:
+        _state["depth"] -= 1
+
+def _set(owner, attr, value):
+    if getattr(owner, attr) != value:
+        setattr(owner, attr, value)
+        return True
+    return False
+
+def _set_camera(cam, x, y):
+    if cam is None or not hasattr(cam, "resolution_xy"):
+        return False
+    if tuple(cam.resolution_xy) != (x, y):
+        cam.resolution_xy = (x, y)
+        return True
+    return False
+
+def is_paused():
+    if _state["rendering"]:
+        return True
+    screen = bpy.context.screen
+    return bool(screen and screen.is_animation_playing)
+
+def set_render(scene, x, y):
+    with syncing():
+        _set(scene.render, "resolution_x", x)
+        _set(scene.render, "resolution_y", y)
+        _set(scene, "new_setting_res_x", x)
+        _set(scene, "new_setting_res_y", y)
+
+def push_render(scene):
+    # render resolution -> panel, active camera and overscan
+    if is_syncing() or is_paused():
+        return
+    x = scene.render.resolution_x
+    y = scene.render.resolution_y
+    cam = scene.camera
+    signature = (x, y, cam.name if cam else "")
+    if _last.get(scene.name) == signature:
+        return
+    with syncing():
+        _set(scene, "new_setting_res_x", x)
+        _set(scene, "new_setting_res_y", y)
+        _set_camera(cam, x, y)
+        ov = getattr(scene, "camera_overscan", None)
+        if ov and ov.RO_Activate:
+            _set(ov, "RO_Custom_Res_X", x)
+            _set(ov, "RO_Custom_Res_Y", y)
+    _last[scene.name] = signature
+
+def forget(scene=None):
+    if scene is None:
+        _last.clear()
+    else:
+        _last.pop(scene.name, None)
+
+@persistent
+@diagnostics.instrument
+def _render_started(*args):
+    _state["rendering"] = True
+
+@persistent
+@diagnostics.instrument
+def _render_finished(*args):
+    _state["rendering"] = False
+
+_RENDER_HANDLERS = (
+    ("render_init", _render_started),
+    ("render_complete", _render_finished),
+    ("render_cancel", _render_finished),
+)
+
+def register():
+    for name, fn in _RENDER_HANDLERS:
+        getattr(bpy.app.handlers, name).append(fn)
+
+def unregister():
+    for name, fn in _RENDER_HANDLERS:
+        handlers = getattr(bpy.app.handlers, name)
+        if fn in handlers:
+            handlers.remove(fn)
+    _state["rendering"] = False
+    forget()
@@ -0,0 +1,159 @@
+import bpy
+from collections import defaultdict
+
+SWITCH_PREFIX = "Switch Collection"
+
+_key_colls = defaultdict(set)      # key -> collection names
+_key_objs = defaultdict(set)       # key -> object names
+_key_camera = {}                   # key -> camera name
+_coll_keys = defaultdict(set)      # collection name -> keys
+_camera_books = defaultdict(set)   # camera name -> Book collection names
+_camera_sources = defaultdict(set) # camera name -> source collection names
+_next_index = {}                   # collection name -> next free key index
+_state = {"built": False}
+
+def is_switch_key(key):
+    return key.startswith(SWITCH_PREFIX)
+
+def key_index(key):
+    return int(key[len(SWITCH_PREFIX):].split('_')[0])
+
+def _is_book(coll_name, cam_name):
+    return coll_name.startswith(f"{cam_name} Book")
+
+def clear():
+    for d in (_key_colls, _key_objs, _key_camera, _coll_keys, _camera_books, _camera_sources, _next_index):
+        d.clear()
+    _state["built"] = False
+
+def _register_collection(coll_name, key, cam_name):
+    _key_colls[key].add(coll_name)
+    _key_camera[key] = cam_name
+    _coll_keys[coll_name].add(key)
+    try:
+        idx = key_index(key)
+    except ValueError:
+        idx = 0
+    if idx >= _next_index.get(coll_name, 1):
+        _next_index[coll_name] = idx + 1
+    if _is_book(coll_name, cam_name):
+        _camera_books[cam_name].add(coll_name)
+    else:
+        _camera_sources[cam_name].add(coll_name)
+
+def rebuild():
+    clear()
+    for coll in bpy.data.collections:
+        for key, val in coll.items():
+            if is_switch_key(key) and isinstance(val, str):
+                _register_collection(coll.name, key, val)
+    for o in bpy.data.objects:
+        for key in o.keys():
+            if is_switch_key(key):
+                _key_objs[key].add(o.name)
+    _state["built"] = True
+
+def ensure():
+    if not _state["built"]:
+        rebuild()
+
+def add(coll, key, cam_name):
+    ensure()
+    _register_collection(coll.name, key, cam_name)
+
+def discard_collection(coll_name):
+    _next_index.pop(coll_name, None)
+    for key in _coll_keys.pop(coll_name, ()):
+        _key_colls[key].discard(coll_name)
+        if not _key_colls[key]:
+            del _key_colls[key]
+            _key_camera.pop(key, None)
+    for d in (_camera_books, _camera_sources):
+        for names in d.values():
+            names.discard(coll_name)
+
+def discard_object_key(obj_name, key):
+    names = _key_objs.get(key)
+    if names is not None:
+        names.discard(obj_name)
+        if not names:
+            del _key_objs[key]
+
+def _resolve(names, key=None):
+    # Returns None when the registry no longer matches the file (rename,
+    # outliner delete, purge); callers rebuild and ask again.
+    found = []
+    for name in names:
+        coll = bpy.data.collections.get(name)
+        if coll is None:
+            return None
+        if key is not None and key not in coll:
+            return None
+        found.append(coll)
+    return found
+
+def _lookup(fn):
+    ensure()
+    result = fn()
+    if result is None:
+        rebuild()
+        result = fn()
+    return result or []
+
+def _camera_collections(table, cam_name):
+    def fn():
+        found = []
+        for name in sorted(table.get(cam_name, ())):
+            coll = bpy.data.collections.get(name)
+            if coll is None or cam_name not in coll.values():
+                return None
+            found.append(coll)
+        return found
+    return _lookup(fn)
+
+def sources(cam_name):
+    return _camera_collections(_camera_sources, cam_name)
+
+def books(cam_name):
+    return _camera_collections(_camera_books, cam_name)
+
+def keyed(cam_name):
+    return sources(cam_name) + books(cam_name)
+
+def keyed_collections():
+    def fn():
+        return _resolve(sorted(_coll_keys))
+    return _lookup(fn)
+
+def collections_for_key(key):
+    def fn():
+        return _resolve(sorted(_key_colls.get(key, ())), key)
+    return _lookup(fn)
+
+def keys_for_collection(coll):
+    ensure()
+    return set(_coll_keys.get(coll.name, ()))
+
+def has_keys(coll):
+    ensure()
+    return bool(_coll_keys.get(coll.name))
+
+def next_index(coll):
+    ensure()
+    return _next_index.get(coll.name, 1)
+
+def unpaired():
+    def fn():
+        result = []
+        for key, names in _key_colls.items():
+            colls = _resolve(names, key)
+            if colls is None:
+                return None
+            if len(colls) < 2:
+                result.extend(colls)
+        return result
+    return _lookup(fn)
+
+def object_keys():
+    ensure()
+    return {key: set(names) for key, names in _key_objs.items()}
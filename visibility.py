@@ -0,0 +1,219 @@
+import bpy
+from . import collection_graph
+from . import switch_registry
+
+EYE_LEVEL_NAME = "EyeLevelCircle"
+
+# scene name -> (applied CutState, camera-name signature, switch mode)
+_applied = {}
+
+def invalidate(scene=None):
+    if scene is None:
+        _applied.clear()
+        _snapshots.clear()
+    else:
+        _applied.pop(scene.name, None)
+        for key in [k for k in _snapshots if k[0] == scene.name]:
+            del _snapshots[key]
+
+def _camera_signature(scene):
+    return frozenset(item.name for item in scene.camera_list)
+
+def _set_object_visible(o, visible):
+    hidden = not visible
+    try:
+        if o.hide_get() != hidden:
+            o.hide_set(hidden)
+    except RuntimeError:
+        pass
+    if o.hide_viewport != hidden:
+        o.hide_viewport = hidden
+    if o.hide_render != hidden:
+        o.hide_render = hidden
+
+def _set_collection_visible(coll, visible):
+    hidden = not visible
+    if coll.hide_viewport != hidden:
+        coll.hide_viewport = hidden
+    if coll.hide_render != hidden:
+        coll.hide_render = hidden
+
+def _set_collection_included(view_layer, coll, included):
+    for lc in collection_graph.layer_collections(view_layer, coll):
+        if lc.exclude == included:
+            lc.exclude = not included
+
+# Visibility snapshot of one cut: the collections and objects it shows or
+# hides, plus the camera's resolution and eye-level flag.
+class CutState:
+    def __init__(self, cam):
+        self.camera = cam
+        self.roots = {c for c in cam.users_collection if not c.is_embedded_data}
+        self.books = set()
+        book_prefix = f"{cam.name} Book"
+        for root in self.roots:
+            for child in root.children:
+                if child.name.startswith(book_prefix):
+                    self.books.add(child)
+        shown = self.roots | self.books
+        self.sources = {c for c in switch_registry.keyed(cam.name) if c not in shown}
+
+        self.show_objs = {cam}
+        for coll in shown:
+            self.show_objs.update(coll.objects)
+        self.hide_objs = set()
+        for coll in self.sources:
+            self.hide_objs.update(o for o in coll.objects if o not in self.show_objs)
+
+        self.signature = self._signature()
+        self.refresh_camera()
+
+    def _signature(self):
+        # Cheap membership fingerprint: counts per referenced collection and
+        # the registry's keyed collections. Costs O(collections in the cut).
+        colls = sorted(self.roots | self.books | self.sources, key=lambda c: c.name_full)
+        return (
+            len(self.camera.users_collection),
+            tuple((c.name_full, len(c.objects), len(c.children)) for c in colls),
+            tuple(sorted(c.name_full for c in switch_registry.keyed(self.camera.name))),
+        )
+
+    def is_current(self, cam):
+        try:
+            return self.camera == cam and self._signature() == self.signature
+        except ReferenceError:
+            return False
+
+    def refresh_camera(self):
+        res = getattr(self.camera, 'resolution_xy', None)
+        self.resolution = tuple(res) if res and len(res) == 2 else None
+        self.eye_level = bool(self.camera.get("EyeLevel"))
+
+_snapshots = {}  # (scene name, camera name) -> CutState
+
+def cut_state(scene, cam):
+    key = (scene.name, cam.name)
+    state = _snapshots.get(key)
+    if state is None or not state.is_current(cam):
+        state = CutState(cam)
+        _snapshots[key] = state
+    else:
+        state.refresh_camera()
+    return state
+
+def build_snapshots(scene):
+    count = 0
+    for item in scene.camera_list:
+        cam = bpy.data.objects.get(item.name)
+        if cam and cam.type == 'CAMERA':
+            cut_state(scene, cam)
+            count += 1
+    return count
+
+def invalidate_cut(scene, cam_name):
+    _snapshots.pop((scene.name, cam_name), None)
+
+def _restore(old, new):
+    for coll in old.roots - new.roots - new.books:
+        _set_collection_visible(coll, False)
+    for coll in old.sources - new.sources:
+        _set_collection_visible(coll, True)
+    for o in old.hide_objs - new.hide_objs:
+        _set_object_visible(o, True)
+
+def _apply(new):
+    for coll in new.roots | new.books:
+        _set_collection_visible(coll, True)
+    for o in new.show_objs:
+        _set_object_visible(o, True)
+    for coll in new.sources:
+        _set_collection_visible(coll, False)
+    for o in new.hide_objs:
+        _set_object_visible(o, False)
+
+def _restore_layer(view_layer, old, new):
+    for coll in old.roots - new.roots - new.books:
+        _set_collection_included(view_layer, coll, False)
+    for coll in old.sources - new.sources:
+        _set_collection_included(view_layer, coll, True)
+
+def _apply_layer(view_layer, new):
+    for coll in new.roots | new.books:
+        _set_collection_included(view_layer, coll, True)
+    for coll in new.sources:
+        _set_collection_included(view_layer, coll, False)
+
+def _cut_collections():
+    keyed = set(switch_registry.keyed_collections())
+    cut_roots = {
+        coll for coll in bpy.data.collections
+        if coll not in keyed and any(o.type == 'CAMERA' for o in coll.objects)
+    }
+    return keyed, cut_roots
+
+def _full_sync(scene, view_layer, new):
+    for o in scene.objects:
+        if o.name == EYE_LEVEL_NAME:
+            continue
+        in_collection = any(not c.is_embedded_data for c in o.users_collection)
+        _set_object_visible(o, in_collection)
+    keyed, cut_roots = _cut_collections()
+    for coll in keyed:
+        _set_collection_visible(coll, True)
+        _set_collection_included(view_layer, coll, True)
+    for coll in cut_roots:
+        _set_collection_visible(coll, False)
+        _set_collection_included(view_layer, coll, True)
+    _apply(new)
+
+def _full_sync_layer(scene, view_layer, new):
+    # Clear whatever object-mode switching left behind, then drive
+    # everything through LayerCollection.exclude.
+    for o in scene.objects:
+        if o.name != EYE_LEVEL_NAME:
+            _set_object_visible(o, True)
+    keyed, cut_roots = _cut_collections()
+    for coll in keyed:
+        _set_collection_visible(coll, True)
+        _set_collection_included(view_layer, coll, True)
+    for coll in cut_roots:
+        _set_collection_visible(coll, True)
+        _set_collection_included(view_layer, coll, False)
+    _apply_layer(view_layer, new)
+
+def _switch(scene, cam, view_layer, mode):
+    # The outgoing cut is restored from the state that was actually applied,
+    # not a fresh one: objects that have since left its hidden set (e.g. a
+    # dissolved Book source) still need to be shown again.
+    signature = _camera_signature(scene)
+    old, prev_signature, prev_mode = _applied.get(scene.name, (None, None, None))
+    prev_cam = old.camera if old is not None else None
+    if prev_cam is not None and prev_cam.name not in bpy.data.objects:
+        prev_cam = None
+
+    new = cut_state(scene, cam)
+    if prev_cam is None or prev_signature != signature or prev_mode != mode:
+        if mode == 'LAYER':
+            _full_sync_layer(scene, view_layer, new)
+        else:
+            _full_sync(scene, view_layer, new)
+    elif mode == 'LAYER':
+        if old is not new:
+            _restore_layer(view_layer, old, new)
+        _apply_layer(view_layer, new)
+    else:
+        if old is not new:
+            _restore(old, new)
+        _apply(new)
+    _applied[scene.name] = (new, signature, mode)
+    return new
+
+def switch_cut(scene, cam, view_layer=None, mode='OBJECT'):
+    if view_layer is None:
+        view_layer = bpy.context.view_layer
+    try:
+        return _switch(scene, cam, view_layer, mode)
+    except ReferenceError:
+        # A datablock held by a snapshot was deleted behind our back.
+        invalidate(scene)
+        return _switch(scene, cam, view_layer, mode)